@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accounts'
+
+    def ready(self):
+        from . import budget  # noqa: F401  (keeps BrandBudget in step with projects and hires)
+        from . import identity  # noqa: F401  (registers invalidation signals)
+        from . import notifications  # noqa: F401  (keeps the cached unread counter in step)
+        from . import ratings  # noqa: F401  (maintains User.rating_sum/rating_count)
+        from . import skills  # noqa: F401  (keeps Project.skills in step with skills_required)
+        from . import stats  # noqa: F401  (invalidates cached creator_stats)
@@ -1,15 +1,84 @@
+import base64
+import binascii
+import logging
+import re
+
 import jwt
-import os
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from rest_framework import authentication, exceptions
 
+from .identity import identity_cache
+from .jwks import key_set
+from .token_cache import token_cache
+
 User = get_user_model()
+logger = logging.getLogger(__name__)
+
+BASE64_RE = re.compile(r"^[A-Za-z0-9+/]*={0,2}$")
+
+_signing_key = (None, None)
+
+
+def decode_secret(secret):
+    """
+    Supabase secrets are often base64 encoded; use the raw string otherwise.
+    """
+    if len(secret) % 4 == 0 and BASE64_RE.match(secret):
+        try:
+            return base64.b64decode(secret)
+        except (binascii.Error, ValueError) as e:
+            logger.debug("SUPABASE_JWT_SECRET base64 decode failed: %s", e)
+    return secret
+
+
+def get_signing_key():
+    """
+    Decoded SUPABASE_JWT_SECRET, resolved once and reused until the
+    setting changes.
+    """
+    global _signing_key
+    secret = getattr(settings, "SUPABASE_JWT_SECRET", None)
+    if _signing_key[0] != secret:
+        _signing_key = (secret, decode_secret(secret) if secret else None)
+    return _signing_key[1]
+
+
+def verify_token(token):
+    """
+    Verified payload for `token`, served from token_cache when possible.
+    Raises jwt.InvalidTokenError.
+    """
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+
+    # Pick the key from the header instead of trying each one
+    header = jwt.get_unverified_header(token)
+    if header.get("alg") == "HS256":
+        key = get_signing_key()
+        if key is None:
+            raise jwt.InvalidTokenError("SUPABASE_JWT_SECRET is not configured")
+        algorithm = "HS256"
+    else:
+        entry = key_set.get(header.get("kid"))
+        if entry is None:
+            raise jwt.InvalidTokenError(f"No verification key for kid {header.get('kid')!r}")
+        key, algorithm = entry
+
+    payload = jwt.decode(
+        token,
+        key=key,
+        algorithms=[algorithm],
+        options={"verify_aud": False}
+    )
+    token_cache.set(token, payload)
+    return payload
+
 
 class SupabaseAuthentication(authentication.BaseAuthentication):
     def authenticate(self, request):
         auth_header = request.META.get('HTTP_AUTHORIZATION')
-        print(f"DEBUG: Authorization Header present: {bool(auth_header)}")
         if not auth_header:
             return None
 
@@ -18,59 +87,27 @@ class SupabaseAuthentication(authentication.BaseAuthentication):
         except (IndexError, AttributeError):
             return None
 
-        # Reload settings to ensure we have the latest .env
-        secret = os.environ.get('SUPABASE_JWT_SECRET')
-        print(f"DEBUG: Authenticating request. Secret found: {bool(secret)}")
-        if not secret:
-            print("ERROR: SUPABASE_JWT_SECRET not found in environment!")
+        if get_signing_key() is None and key_set.path is None:
+            logger.error("Neither SUPABASE_JWT_SECRET nor SUPABASE_JWKS_PATH is configured!")
             return None
 
-        # Supabase secrets are often base64 encoded
-        import base64
         try:
-            # Check if it looks like base64
-            if len(secret) % 4 == 0 and all(c in "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=" for c in secret):
-                decoded_secret = base64.b64decode(secret)
-                print("DEBUG: Secret successfully base64 decoded.")
-            else:
-                decoded_secret = secret
-        except Exception as e:
-            print(f"DEBUG: Base64 decode failed: {e}")
-            decoded_secret = secret
-
-        try:
-            # Debug: See what algorithm is being used
-            header = jwt.get_unverified_header(token)
-            unverified_payload = jwt.decode(token, options={"verify_signature": False})
-            print(f"DEBUG: JWT Header: {header}")
-            print(f"DEBUG: Unverified Payload: {unverified_payload}")
-
-            # Force algorithm to HS256 if the secret is a symmetric key
-            # If the header says ES256 but we have a symmetric secret, something is wrong.
-            # But let's try to decode with the decoded secret.
-            payload = jwt.decode(
-                token, 
-                key=decoded_secret, 
-                algorithms=["HS256", "ES256"],
-                options={"verify_aud": False}
-            )
-            print(f"DEBUG: JWT Payload: {payload}")
+            payload = verify_token(token)
         except jwt.ExpiredSignatureError:
             raise exceptions.AuthenticationFailed('Token has expired')
         except Exception as e:
-            # Log the specific error for debugging if needed
-            print(f"JWT Verification Failed: {str(e)}")
-            raise exceptions.AuthenticationFailed(f'Invalid token')
+            logger.debug("JWT verification failed: %s", e)
+            raise exceptions.AuthenticationFailed('Invalid token')
 
         email = payload.get('email')
         if not email:
             return None
-        
+
         try:
-            user = User.objects.get(email=email)
+            user = identity_cache.resolve(email)
         except User.DoesNotExist:
             user = User.objects.create(
-                username=email.split('@')[0], 
+                username=email.split('@')[0],
                 email=email,
                 role=payload.get('user_metadata', {}).get('role', 'creator')
             )
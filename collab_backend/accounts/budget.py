@@ -0,0 +1,246 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Application, BrandBudget, BudgetLedgerEntry, Project
+
+User = get_user_model()
+
+ZERO = Decimal("0.00")
+LEDGER_FIELDS = {BudgetLedgerEntry.ALLOCATE: "allocated", BudgetLedgerEntry.COMMIT: "committed"}
+
+
+def record(brand_id, project_id, kind, amount):
+    """
+    Append a signed ledger entry and apply it to the brand's running
+    totals with UPDATE ... SET x = x + amount, so concurrent writers never
+    overwrite each other. Callers run inside the model's save() transaction.
+    """
+    if brand_id is None or not amount:
+        return
+    BudgetLedgerEntry.objects.create(brand_id=brand_id, project_id=project_id, kind=kind, amount=amount)
+
+    field = LEDGER_FIELDS[kind]
+    changes = {field: F(field) + amount, "updated_at": timezone.now()}
+    if not BrandBudget.objects.filter(brand_id=brand_id).update(**changes):
+        BrandBudget.objects.get_or_create(brand_id=brand_id)
+        BrandBudget.objects.filter(brand_id=brand_id).update(**changes)
+
+
+def locked_project(project_id):
+    """
+    (brand_id, budget) read under a row lock, so a hire and a concurrent
+    budget edit of the same project apply one after the other.
+    """
+    return Project.objects.select_for_update().filter(pk=project_id).values_list("brand_id", "budget").first()
+
+
+def hired_count(project_id):
+    return Application.objects.filter(project_id=project_id, status="hired").count()
+
+
+def deleting_brand(origin, brand_id):
+    # The brand's ledger rows are cascading away with it; nothing to keep in step
+    return isinstance(origin, User) and origin.pk == brand_id
+
+
+# The pre_save snapshots lock the row they read: both run inside the
+# transaction.atomic() opened by Project.save()/Application.save(), so a
+# concurrent save of the same row waits instead of computing its delta from
+# the same stale "before" value.
+
+@receiver(pre_save, sender=Project)
+def remember_previous_budget(sender, instance, **kwargs):
+    instance._budget_before = None
+    if instance.pk is not None:
+        instance._budget_before = locked_project(instance.pk)
+
+
+@receiver(post_save, sender=Project)
+def apply_project_budget(sender, instance, created, **kwargs):
+    before = getattr(instance, "_budget_before", None)
+    budget = Decimal(instance.budget)
+    if before is None:
+        record(instance.brand_id, instance.pk, BudgetLedgerEntry.ALLOCATE, budget)
+        return
+
+    old_brand_id, old_budget = before
+    if old_brand_id == instance.brand_id and old_budget == budget:
+        return
+
+    # Every hire is committed at the project's budget, so a budget edit moves
+    # committed by the delta once per hired application
+    hires = hired_count(instance.pk)
+    if old_brand_id == instance.brand_id:
+        delta = budget - old_budget
+        record(instance.brand_id, instance.pk, BudgetLedgerEntry.ALLOCATE, delta)
+        record(instance.brand_id, instance.pk, BudgetLedgerEntry.COMMIT, delta * hires)
+    else:
+        record(old_brand_id, instance.pk, BudgetLedgerEntry.ALLOCATE, -old_budget)
+        record(old_brand_id, instance.pk, BudgetLedgerEntry.COMMIT, -old_budget * hires)
+        record(instance.brand_id, instance.pk, BudgetLedgerEntry.ALLOCATE, budget)
+        record(instance.brand_id, instance.pk, BudgetLedgerEntry.COMMIT, budget * hires)
+
+
+@receiver(post_delete, sender=Project)
+def release_project_budget(sender, instance, origin=None, **kwargs):
+    # Hired applications release their own commitment as they cascade away
+    if deleting_brand(origin, instance.brand_id):
+        return
+    record(instance.brand_id, instance.pk, BudgetLedgerEntry.ALLOCATE, -Decimal(instance.budget))
+
+
+@receiver(pre_save, sender=Application)
+def remember_previous_hire(sender, instance, **kwargs):
+    instance._hire_before = None
+    if instance.pk is not None:
+        instance._hire_before = (
+            Application.objects.select_for_update().filter(pk=instance.pk)
+            .values_list("project_id", "status")
+            .first()
+        )
+
+
+@receiver(post_save, sender=Application)
+def apply_hire(sender, instance, created, **kwargs):
+    before = getattr(instance, "_hire_before", None)
+    was_hired = before is not None and before[1] == "hired"
+    is_hired = instance.status == "hired"
+    if was_hired == is_hired and (not is_hired or before[0] == instance.project_id):
+        return
+
+    # Commit at the project's current budget, read under its lock
+    if was_hired:
+        project = locked_project(before[0])
+        if project is not None:
+            record(project[0], before[0], BudgetLedgerEntry.COMMIT, -project[1])
+    if is_hired:
+        brand_id, budget = locked_project(instance.project_id)
+        record(brand_id, instance.project_id, BudgetLedgerEntry.COMMIT, budget)
+
+
+@receiver(post_delete, sender=Application)
+def release_hire(sender, instance, origin=None, **kwargs):
+    if instance.status != "hired":
+        return
+    if isinstance(origin, Project):
+        brand_id, budget = origin.brand_id, Decimal(origin.budget)
+    else:
+        project = locked_project(instance.project_id)
+        if project is None:
+            return
+        brand_id, budget = project
+    if deleting_brand(origin, brand_id):
+        return
+    record(brand_id, instance.project_id, BudgetLedgerEntry.COMMIT, -budget)
+
+
+def budget_summary(brand_id):
+    """
+    {"total_allocated", "committed", "available"} from the brand's ledger
+    row: a single primary-key lookup instead of two aggregates.
+    """
+    ledger = BrandBudget.objects.filter(brand_id=brand_id).values_list("allocated", "committed").first()
+    allocated, committed = ledger or (ZERO, ZERO)
+    return {
+        "total_allocated": allocated,
+        "committed": committed,
+        "available": allocated - committed,
+    }
+
+
+def project_breakdown(brand_id):
+    """
+    The brand's projects annotated with their allocated/committed share of
+    the ledger, grouped in one query over the (brand, project) index.
+    """
+    return (
+        BudgetLedgerEntry.objects.filter(brand_id=brand_id, project__brand_id=brand_id)
+        .order_by()
+        .values("project_id", title=F("project__title"))
+        .annotate(
+            allocated=Sum("amount", filter=Q(kind=BudgetLedgerEntry.ALLOCATE), default=ZERO),
+            committed=Sum("amount", filter=Q(kind=BudgetLedgerEntry.COMMIT), default=ZERO),
+        )
+        .annotate(available=F("allocated") - F("committed"))
+        .order_by("-project_id")
+    )
+
+
+def monthly_series(brand_id, months=None):
+    """
+    Per-month allocated/committed deltas with running totals, oldest first.
+    Running totals cover the brand's whole history; `months` only trims
+    the output to the most recent months.
+    """
+    rows = (
+        BudgetLedgerEntry.objects.filter(brand_id=brand_id)
+        .annotate(month=TruncMonth("created_at"))
+        .order_by()
+        .values("month")
+        .annotate(
+            allocated=Sum("amount", filter=Q(kind=BudgetLedgerEntry.ALLOCATE), default=ZERO),
+            committed=Sum("amount", filter=Q(kind=BudgetLedgerEntry.COMMIT), default=ZERO),
+        )
+        .order_by("month")
+    )
+
+    series = []
+    total_allocated = total_committed = ZERO
+    for row in rows:
+        total_allocated += row["allocated"]
+        total_committed += row["committed"]
+        series.append({
+            "month": row["month"].strftime("%Y-%m"),
+            "allocated": row["allocated"],
+            "committed": row["committed"],
+            "total_allocated": total_allocated,
+            "total_committed": total_committed,
+            "available": total_allocated - total_committed,
+        })
+    return series[-months:] if months else series
+
+
+def reconcile_budgets(fix=False):
+    """
+    Compare every BrandBudget against totals recomputed from Project and
+    hired Application in two grouped aggregates. With fix=True each drift
+    is booked as a correction entry (project=None) so the ledger history
+    still sums to the stored totals. Returns [(brand_id, stored, actual)].
+    """
+    actual = {}
+    for row in Project.objects.order_by().values("brand_id").annotate(total=Sum("budget")):
+        actual[row["brand_id"]] = [row["total"], ZERO]
+    hired = (
+        Application.objects.filter(status="hired")
+        .order_by()
+        .values("project__brand_id")
+        .annotate(total=Sum("project__budget"))
+    )
+    for row in hired:
+        actual.setdefault(row["project__brand_id"], [ZERO, ZERO])[1] = row["total"]
+
+    stored = {
+        brand_id: (allocated, committed)
+        for brand_id, allocated, committed in BrandBudget.objects.values_list("brand_id", "allocated", "committed")
+    }
+
+    mismatches = []
+    for brand_id in sorted(set(actual) | set(stored)):
+        expected = tuple(actual.get(brand_id, (ZERO, ZERO)))
+        current = stored.get(brand_id, (ZERO, ZERO))
+        if current != expected:
+            mismatches.append((brand_id, current, expected))
+
+    if fix:
+        for brand_id, current, expected in mismatches:
+            with transaction.atomic():
+                record(brand_id, None, BudgetLedgerEntry.ALLOCATE, expected[0] - current[0])
+                record(brand_id, None, BudgetLedgerEntry.COMMIT, expected[1] - current[1])
+    return mismatches
@@ -0,0 +1,55 @@
+from django.core.cache import cache
+
+# Version tokens for cached values that are recomputed on a miss.
+#
+# A write that commits while a miss is being recomputed invalidates a key
+# that is not there yet, and the recompute then caches the pre-write value
+# for its whole TTL. Writers therefore bump the key's version before
+# invalidating, and readers drop what they just cached if the version moved
+# while they were computing it.
+
+
+def version_key(key):
+    return f"{key}:version"
+
+
+def bump_version(key, ttl):
+    """
+    Mark `key` as changed. Called from the writer's on_commit callback,
+    before the cached value itself is invalidated or adjusted.
+    """
+    key = version_key(key)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, ttl):
+            cache.incr(key)
+
+
+def read_versions(keys):
+    return cache.get_many([version_key(key) for key in keys])
+
+
+def discard_changed(keys, versions):
+    """
+    Delete the entries among `keys` whose version moved since `versions`
+    (from read_versions) was taken.
+    """
+    current = read_versions(keys)
+    changed = [key for key in keys if current.get(version_key(key)) != versions.get(version_key(key))]
+    if changed:
+        cache.delete_many(changed)
+
+
+def get_or_compute(key, compute, ttl):
+    """
+    Cached compute(). A miss computes and adds the value, then drops it
+    again if a write bumped the version meanwhile.
+    """
+    value = cache.get(key)
+    if value is None:
+        versions = read_versions([key])
+        value = compute()
+        cache.add(key, value, ttl)
+        discard_changed([key], versions)
+    return value
@@ -0,0 +1,142 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import BrandProfile, CreatorProfile
+
+User = get_user_model()
+
+PROFILE_RELATIONS = ("creatorprofile", "brandprofile")
+
+
+def clone_identity(user):
+    """
+    Copy of `user` with its own copies of the preloaded profiles, so a
+    request can mutate request.user or request.user.creatorprofile
+    without touching the cached instances.
+    """
+    clone = copy.copy(user)
+    for name in PROFILE_RELATIONS:
+        profile = clone._state.fields_cache.get(name)
+        if profile is not None:
+            profile = copy.copy(profile)
+            profile._state.fields_cache["user"] = clone
+            clone._state.fields_cache[name] = profile
+    return clone
+
+
+class IdentityCache:
+    """
+    In-process LRU + TTL cache of authenticated users keyed by email.
+
+    Entries are loaded with select_related("creatorprofile", "brandprofile"),
+    so role and profile checks in views (hasattr(user, "brandprofile"),
+    user.creatorprofile.id, ...) are answered from memory, including the
+    "no profile" case. Saves and deletes of the user or either profile
+    invalidate through signals; the TTL bounds staleness from other
+    processes and from queryset.update() writes.
+    """
+
+    def __init__(self, maxsize=10000, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._emails = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def get(self, email):
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is not None:
+                user, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(email)
+                    self.hits += 1
+                    return clone_identity(user)
+                self._pop(email)
+            self.misses += 1
+        return None
+
+    def set(self, email, user, generation=None):
+        with self._lock:
+            # Skip if an invalidation happened while the row was being loaded
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[email] = (clone_identity(user), time.monotonic() + self.ttl)
+            self._entries.move_to_end(email)
+            self._emails[user.pk] = email
+            while len(self._entries) > self.maxsize:
+                oldest = next(iter(self._entries))
+                self._pop(oldest)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._generation += 1
+            email = self._emails.get(user_id)
+            if email is not None:
+                self._pop(email)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._emails.clear()
+            self.hits = self.misses = 0
+
+    @property
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._entries),
+        }
+
+    def _pop(self, email):
+        entry = self._entries.pop(email, None)
+        if entry is not None:
+            self._emails.pop(entry[0].pk, None)
+
+    def resolve(self, email):
+        """
+        Cached User with creatorprofile/brandprofile preloaded, in a single
+        joined query on a miss. Raises User.DoesNotExist.
+        """
+        user = self.get(email)
+        if user is not None:
+            return user
+
+        generation = self._generation
+        user = User.objects.select_related(*PROFILE_RELATIONS).get(email=email)
+        self.set(email, user, generation)
+        return user
+
+
+identity_cache = IdentityCache(
+    maxsize=getattr(settings, "IDENTITY_CACHE_MAX_SIZE", 10000),
+    ttl=getattr(settings, "IDENTITY_CACHE_TTL", 60),
+)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_identity(sender, instance, **kwargs):
+    identity_cache.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=CreatorProfile)
+@receiver(post_delete, sender=CreatorProfile)
+@receiver(post_save, sender=BrandProfile)
+@receiver(post_delete, sender=BrandProfile)
+def invalidate_cached_profile_owner(sender, instance, **kwargs):
+    identity_cache.invalidate(instance.user_id)
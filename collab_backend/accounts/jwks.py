@@ -0,0 +1,143 @@
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+
+import jwt
+from cryptography.exceptions import UnsupportedAlgorithm
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from cryptography.hazmat.primitives.serialization import load_pem_public_key
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+EC_ALGORITHMS = {"secp256r1": "ES256", "secp384r1": "ES384", "secp521r1": "ES512"}
+
+
+def pem_algorithm(key):
+    if isinstance(key, ec.EllipticCurvePublicKey):
+        return EC_ALGORITHMS.get(key.curve.name)
+    if isinstance(key, rsa.RSAPublicKey):
+        return "RS256"
+    if isinstance(key, ed25519.Ed25519PublicKey):
+        return "EdDSA"
+    return None
+
+
+def parse_jwks(data):
+    """
+    {kid: (key, algorithm)} from a JWKS document or a single JWK. Keys that
+    cannot be used (unsupported kty/crv, bad parameters) are skipped so
+    they never take the rest of the set down with them.
+    """
+    if not isinstance(data, dict):
+        raise ValueError(f"expected a JWKS or JWK object, got {type(data).__name__}")
+
+    keys = {}
+    for jwk in data.get("keys", [data]):
+        if not isinstance(jwk, dict) or jwk.get("use", "sig") != "sig" or "kid" not in jwk:
+            continue
+        try:
+            parsed = jwt.PyJWK(jwk)
+        except jwt.PyJWTError as e:
+            logger.warning("Skipping JWK %s: %s", jwk.get("kid"), e)
+            continue
+        keys[parsed.key_id] = (parsed.key, parsed.algorithm_name)
+    return keys
+
+
+def parse_pem(path):
+    """
+    {kid: (key, algorithm)} for a PEM public key; the file stem is the kid.
+    """
+    key = load_pem_public_key(path.read_bytes())
+    algorithm = pem_algorithm(key)
+    if algorithm is None:
+        logger.warning("Skipping %s: unsupported key type", path)
+        return {}
+    return {path.stem: (key, algorithm)}
+
+
+class KeySet:
+    """
+    Public verification keys indexed by `kid`, read from a JWKS file or a
+    directory of *.json (JWKS/JWK) and *.pem files.
+
+    Keys are parsed once. The source's mtimes are re-checked at most every
+    `check_interval` seconds and the set is rebuilt only when they change,
+    so rotating keys needs no restart and the hot path stays a dict lookup.
+    A source that fails to parse keeps the previous keys in place.
+    """
+
+    def __init__(self, path, check_interval=5):
+        self.path = Path(path) if path else None
+        self.check_interval = check_interval
+        self.reloads = 0
+        self._keys = {}
+        self._stamp = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        self._maybe_reload()
+        return len(self._keys)
+
+    def get(self, kid):
+        """
+        (key, algorithm) for `kid`, or None.
+        """
+        self._maybe_reload()
+        return self._keys.get(kid)
+
+    def _files(self):
+        if self.path.is_dir():
+            return sorted(
+                p for p in self.path.iterdir()
+                if p.suffix in (".json", ".pem") and p.is_file()
+            )
+        return [self.path]
+
+    def _current_stamp(self):
+        try:
+            return tuple((str(p), p.stat().st_mtime_ns) for p in self._files())
+        except OSError:
+            return None
+
+    def _maybe_reload(self):
+        if self.path is None:
+            return
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+
+        with self._lock:
+            if now - self._checked_at < self.check_interval:
+                return
+            self._checked_at = now
+            stamp = self._current_stamp()
+            if stamp is None or stamp == self._stamp:
+                return
+            try:
+                self._keys = self._load()
+            except (OSError, ValueError, UnsupportedAlgorithm) as e:
+                logger.warning("Keeping previous JWT keys; failed to load %s: %s", self.path, e)
+                return
+            self._stamp = stamp
+            self.reloads += 1
+            logger.info("Loaded %d JWT verification keys from %s", len(self._keys), self.path)
+
+    def _load(self):
+        keys = {}
+        for path in self._files():
+            if path.suffix == ".pem":
+                keys.update(parse_pem(path))
+            else:
+                keys.update(parse_jwks(json.loads(path.read_text())))
+        return keys
+
+
+key_set = KeySet(
+    getattr(settings, "SUPABASE_JWKS_PATH", None),
+    check_interval=getattr(settings, "SUPABASE_JWKS_CHECK_INTERVAL", 5),
+)
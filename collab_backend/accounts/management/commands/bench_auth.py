@@ -0,0 +1,199 @@
+import asyncio
+import json
+import shutil
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import ec
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import RequestFactory
+from django.test.utils import setup_test_environment, teardown_test_environment
+from jwt.algorithms import ECAlgorithm
+
+from backend.bench import QueryCounter
+
+User = get_user_model()
+
+BENCH_SECRET = "bench-supabase-jwt-secret-0123456789"
+BENCH_KID = "bench-es256"
+
+
+def make_tokens(user, es256_key):
+    now = int(time.time())
+    claims = {"email": user.email, "user_metadata": {"role": user.role}}
+    return {
+        "supabase": {
+            "valid_hs256": jwt.encode({**claims, "exp": now + 3600}, BENCH_SECRET, algorithm="HS256"),
+            "valid_es256": jwt.encode(
+                {**claims, "exp": now + 3600}, es256_key, algorithm="ES256", headers={"kid": BENCH_KID}
+            ),
+            "expired": jwt.encode({**claims, "exp": now - 60}, BENCH_SECRET, algorithm="HS256"),
+            "bad_signature": jwt.encode({**claims, "exp": now + 3600}, "not-the-secret", algorithm="HS256"),
+            "malformed": "not.a.jwt",
+        },
+        "channels": {
+            "valid": jwt.encode({"user_id": user.id, "exp": now + 3600}, settings.SECRET_KEY, algorithm="HS256"),
+            "expired": jwt.encode({"user_id": user.id, "exp": now - 60}, settings.SECRET_KEY, algorithm="HS256"),
+            "malformed": "not.a.jwt",
+        },
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure per-call cost of SupabaseAuthentication and chat JWTAuthMiddleware "
+        "for valid, expired and malformed tokens with cold and warm caches"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=2000)
+        parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+
+    def handle(self, *args, **options):
+        from accounts import authentication
+        from accounts.jwks import KeySet
+
+        es256_key = ec.generate_private_key(ec.SECP256R1())
+        jwks_dir = Path(tempfile.mkdtemp(prefix="bench_auth_"))
+        jwk = json.loads(ECAlgorithm.to_jwk(es256_key.public_key()))
+        (jwks_dir / "jwks.json").write_text(json.dumps({"keys": [{**jwk, "kid": BENCH_KID, "alg": "ES256"}]}))
+
+        original_secret = getattr(settings, "SUPABASE_JWT_SECRET", None)
+        original_key_set = authentication.key_set
+        settings.SUPABASE_JWT_SECRET = BENCH_SECRET
+        authentication.key_set = KeySet(jwks_dir)
+
+        # Never touch the real database: run against a throwaway test DB
+        setup_test_environment()
+        connection = connections["default"]
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        counter = QueryCounter()
+        connection_created.connect(counter.attach)
+        counter.attach(connection)
+        try:
+            user = User.objects.create(username="bench_auth", email="bench_auth@bench.local", role="creator")
+            tokens = make_tokens(user, es256_key)
+            results = {
+                "supabase": self.bench_supabase(tokens["supabase"], options["iterations"], counter),
+                "channels": self.bench_channels(tokens["channels"], options["iterations"], counter),
+            }
+        finally:
+            connection_created.disconnect(counter.attach)
+            settings.SUPABASE_JWT_SECRET = original_secret
+            authentication.key_set = original_key_set
+            shutil.rmtree(jwks_dir, ignore_errors=True)
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options["json"]:
+            self.stdout.write(json.dumps({"iterations": options["iterations"], "results": results}, indent=2))
+            return
+
+        self.stdout.write(f"{'authenticator':<14}{'token':<15}{'cache':<6}{'calls/s':>11}{'us/call':>10}{'queries':>9}{'alloc B':>9}")
+        for name, rows in results.items():
+            for row in rows:
+                self.stdout.write(
+                    f"{name:<14}{row['token']:<15}{row['cache']:<6}{row['calls_per_s']:>11}"
+                    f"{row['us_per_call']:>10}{row['queries_per_call']:>9}{row['alloc_peak_bytes']:>9}"
+                )
+
+    def measure(self, call, reset, warm, iterations, counter):
+        """
+        Time `call` `iterations` times, clearing caches with `reset` before
+        each call when cold. A second, shorter pass under tracemalloc
+        records the peak bytes allocated by a single call.
+        """
+        if warm:
+            reset()
+            call()
+
+        elapsed = 0.0
+        queries_before = counter.count
+        for _ in range(iterations):
+            if not warm:
+                reset()
+            started = time.perf_counter()
+            call()
+            elapsed += time.perf_counter() - started
+        queries = counter.count - queries_before
+
+        samples = max(1, iterations // 20)
+        peaks = []
+        tracemalloc.start()
+        try:
+            for _ in range(samples):
+                if not warm:
+                    reset()
+                baseline = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                call()
+                peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+        finally:
+            tracemalloc.stop()
+
+        return {
+            "cache": "warm" if warm else "cold",
+            "calls_per_s": round(iterations / elapsed) if elapsed else None,
+            "us_per_call": round(elapsed / iterations * 1e6, 2),
+            "queries_per_call": round(queries / iterations, 2),
+            "alloc_peak_bytes": round(sum(peaks) / len(peaks)),
+        }
+
+    def bench_supabase(self, tokens, iterations, counter):
+        from rest_framework import exceptions
+
+        from accounts.authentication import SupabaseAuthentication
+        from accounts.identity import identity_cache
+        from accounts.token_cache import token_cache
+
+        authenticator = SupabaseAuthentication()
+        factory = RequestFactory()
+
+        def reset():
+            token_cache.clear()
+            identity_cache.clear()
+
+        rows = []
+        for label, token in tokens.items():
+            request = factory.get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+
+            def call():
+                try:
+                    authenticator.authenticate(request)
+                except exceptions.AuthenticationFailed:
+                    pass
+
+            for warm in (False, True):
+                rows.append({"token": label, **self.measure(call, reset, warm, iterations, counter)})
+        return rows
+
+    def bench_channels(self, tokens, iterations, counter):
+        from chat.middleware import JWTAuthMiddleware
+        from chat.user_cache import user_cache
+
+        async def inner(scope, receive, send):
+            return scope["user"]
+
+        middleware = JWTAuthMiddleware(inner)
+        loop = asyncio.new_event_loop()
+
+        rows = []
+        try:
+            for label, token in tokens.items():
+                scope = {"type": "websocket", "query_string": f"token={token}".encode()}
+
+                def call():
+                    return loop.run_until_complete(middleware(dict(scope), None, None))
+
+                for warm in (False, True):
+                    rows.append({"token": label, **self.measure(call, user_cache.clear, warm, iterations, counter)})
+        finally:
+            loop.close()
+        return rows
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from accounts.ratings import rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = "Recompute User.rating_sum/rating_count from Review in bulk and fix any drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--dry-run", action="store_true", help="Report mismatches without writing")
+
+    def handle(self, *args, **options):
+        mismatches = rebuild_ratings(chunk_size=options["chunk_size"], dry_run=options["dry_run"])
+
+        for user_id, stored, expected in mismatches[:20]:
+            self.stdout.write(f"user {user_id}: stored sum/count {stored}, actual {expected}")
+        if len(mismatches) > 20:
+            self.stdout.write(f"... and {len(mismatches) - 20} more")
+
+        verb = "Found" if options["dry_run"] else "Fixed"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {len(mismatches)} users with stale rating totals"))
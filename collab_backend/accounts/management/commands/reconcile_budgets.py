@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from accounts.budget import reconcile_budgets
+
+
+class Command(BaseCommand):
+    help = "Check every brand's budget ledger against Project and hired Application totals in bulk"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fix", action="store_true", help="Book correction entries for any drift found")
+
+    def handle(self, *args, **options):
+        mismatches = reconcile_budgets(fix=options["fix"])
+
+        for brand_id, stored, expected in mismatches[:20]:
+            self.stdout.write(
+                f"brand {brand_id}: stored allocated/committed {stored[0]}/{stored[1]}, "
+                f"actual {expected[0]}/{expected[1]}"
+            )
+        if len(mismatches) > 20:
+            self.stdout.write(f"... and {len(mismatches) - 20} more")
+
+        verb = "Fixed" if options["fix"] else "Found"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {len(mismatches)} brands with a drifted budget ledger"))
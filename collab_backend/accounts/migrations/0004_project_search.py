@@ -0,0 +1,68 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:34
+
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector('english', coalesce({row}title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce({row}skills_required, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce({row}description, '')), 'C')
+"""
+
+FORWARD_SQL = [
+    f"""
+    CREATE OR REPLACE FUNCTION accounts_project_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := {SEARCH_VECTOR_SQL.format(row="NEW.")};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER accounts_project_search_vector_trigger
+    BEFORE INSERT OR UPDATE ON accounts_project
+    FOR EACH ROW EXECUTE FUNCTION accounts_project_search_vector_update()
+    """,
+    f"UPDATE accounts_project SET search_vector = {SEARCH_VECTOR_SQL.format(row='')}",
+    "CREATE INDEX project_search_gin ON accounts_project USING gin (search_vector)",
+]
+
+REVERSE_SQL = [
+    "DROP INDEX IF EXISTS project_search_gin",
+    "DROP TRIGGER IF EXISTS accounts_project_search_vector_trigger ON accounts_project",
+    "DROP FUNCTION IF EXISTS accounts_project_search_vector_update()",
+]
+
+
+def run_on_postgres(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_collaboration_approved_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['budget', 'id'], name='project_budget_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['deadline', 'id'], name='project_deadline_idx'),
+        ),
+        # tsvector trigger + GIN index only exist on PostgreSQL; SQLite falls back to icontains
+        migrations.RunPython(run_on_postgres(FORWARD_SQL), run_on_postgres(REVERSE_SQL)),
+    ]
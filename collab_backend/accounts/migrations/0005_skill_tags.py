@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_project_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ProjectSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='accounts.project')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='accounts.skilltag')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='skills',
+            field=models.ManyToManyField(blank=True, related_name='projects', through='accounts.ProjectSkill', to='accounts.skilltag'),
+        ),
+        migrations.AddConstraint(
+            model_name='projectskill',
+            constraint=models.UniqueConstraint(fields=('tag', 'project'), name='project_skill_tag_uniq'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+import re
+
+from django.db import migrations
+
+SKILL_SEPARATORS = re.compile(r"[,;/|\n]+")
+MAX_SKILL_LENGTH = 50
+CHUNK = 500
+
+
+def parse_skills(text):
+    names = []
+    for raw in SKILL_SEPARATORS.split(text or ""):
+        name = " ".join(raw.split()).lower()[:MAX_SKILL_LENGTH]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def backfill_skill_tags(apps, schema_editor):
+    """
+    Parse skills_required of existing projects into SkillTag/ProjectSkill
+    rows, CHUNK projects at a time.
+    """
+    Project = apps.get_model("accounts", "Project")
+    SkillTag = apps.get_model("accounts", "SkillTag")
+    ProjectSkill = apps.get_model("accounts", "ProjectSkill")
+
+    last_id = 0
+    while True:
+        chunk = list(
+            Project.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", "skills_required")[:CHUNK]
+        )
+        if not chunk:
+            break
+        last_id = chunk[-1][0]
+
+        parsed = {project_id: parse_skills(text) for project_id, text in chunk}
+        names = {name for project_names in parsed.values() for name in project_names}
+        SkillTag.objects.bulk_create([SkillTag(name=name) for name in names], ignore_conflicts=True)
+        tag_ids = dict(SkillTag.objects.filter(name__in=names).values_list("name", "id"))
+
+        ProjectSkill.objects.bulk_create(
+            [
+                ProjectSkill(project_id=project_id, tag_id=tag_ids[name])
+                for project_id, project_names in parsed.items()
+                for name in project_names
+            ],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_skill_tags'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_skill_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_backfill_skill_tags'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='creatorprofile',
+            index=models.Index(fields=['primary_platform', 'followers_count', 'id'], name='creator_platform_followers_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='creatorprofile',
+            index=models.Index(fields=['banned', 'approved', 'followers_count', 'id'], name='creator_state_followers_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:38
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+CHUNK = 1000
+
+
+def backfill_ratings(apps, schema_editor):
+    """
+    rating_sum/rating_count from one grouped aggregate over Review.
+    """
+    User = apps.get_model("accounts", "User")
+    Review = apps.get_model("accounts", "Review")
+
+    totals = list(
+        Review.objects.order_by()
+        .values("reviewee_id")
+        .annotate(total=Sum("rating"), count=Count("id"))
+    )
+    for start in range(0, len(totals), CHUNK):
+        User.objects.bulk_update(
+            [
+                User(id=row["reviewee_id"], rating_sum=row["total"], rating_count=row["count"])
+                for row in totals[start:start + CHUNK]
+            ],
+            ["rating_sum", "rating_count"],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_creator_discovery_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:41
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+
+CHUNK = 1000
+
+
+def backfill_budget_ledger(apps, schema_editor):
+    """
+    One allocate entry per project (dated at its creation), one commit
+    entry per hired application, and per-brand totals from two grouped
+    aggregates.
+    """
+    Project = apps.get_model("accounts", "Project")
+    Application = apps.get_model("accounts", "Application")
+    BrandBudget = apps.get_model("accounts", "BrandBudget")
+    BudgetLedgerEntry = apps.get_model("accounts", "BudgetLedgerEntry")
+
+    projects = Project.objects.order_by("id").values_list("id", "brand_id", "budget", "created_at")
+    hires = (
+        Application.objects.filter(status="hired")
+        .order_by("id")
+        .values_list("project_id", "project__brand_id", "project__budget", "created_at")
+    )
+    for kind, rows in (("allocate", projects), ("commit", hires)):
+        batch = []
+        for project_id, brand_id, budget, created_at in rows.iterator(chunk_size=CHUNK):
+            batch.append(BudgetLedgerEntry(
+                brand_id=brand_id, project_id=project_id, kind=kind, amount=budget, created_at=created_at
+            ))
+            if len(batch) == CHUNK:
+                BudgetLedgerEntry.objects.bulk_create(batch)
+                batch = []
+        BudgetLedgerEntry.objects.bulk_create(batch)
+
+    totals = {}
+    for row in BudgetLedgerEntry.objects.order_by().values("brand_id", "kind").annotate(total=Sum("amount")):
+        totals.setdefault(row["brand_id"], {})[row["kind"]] = row["total"]
+    BrandBudget.objects.bulk_create(
+        [
+            BrandBudget(brand_id=brand_id, allocated=kinds.get("allocate", 0), committed=kinds.get("commit", 0))
+            for brand_id, kinds in totals.items()
+        ],
+        batch_size=CHUNK,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_user_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BrandBudget',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('allocated', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('committed', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('brand', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='budget_ledger', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='BudgetLedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('allocate', 'Allocate'), ('commit', 'Commit')], max_length=10)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('brand', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('project', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='accounts.project')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['brand', 'created_at'], name='budget_entry_brand_time_idx'), models.Index(fields=['brand', 'project'], name='budget_entry_brand_proj_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_budget_ledger, migrations.RunPython.noop),
+    ]
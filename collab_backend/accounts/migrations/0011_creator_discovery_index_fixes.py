@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:07
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_notification_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='creatorprofile',
+            name='creator_platform_followers_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='creatorprofile',
+            name='creator_state_followers_idx',
+        ),
+        migrations.AddIndex(
+            model_name='creatorprofile',
+            index=models.Index(django.db.models.functions.text.Upper('primary_platform'), models.F('followers_count'), models.F('id'), name='creator_platform_followers_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='creatorprofile',
+            index=models.Index(fields=['banned', 'followers_count', 'id'], name='creator_state_followers_idx'),
+        ),
+    ]
@@ -1,6 +1,9 @@
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchVectorField
+from django.utils import timezone
+from django.db.models.functions import Upper
 from django.db import models
 import uuid
 
@@ -15,12 +18,14 @@ class User(AbstractUser):
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default="creator")
     last_seen = models.DateTimeField(null=True, blank=True)
     is_online = models.BooleanField(default=False)
+    # Running totals of reviews_received, kept by accounts.ratings; rebuild with `manage.py rebuild_ratings`
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
 
     @property
     def average_rating(self):
-        reviews = self.reviews_received.all()
-        if reviews.exists():
-            return round(sum(review.rating for review in reviews) / reviews.count(), 1)
+        if self.rating_count:
+            return round(self.rating_sum / self.rating_count, 1)
         return 0.0
 
     def __str__(self):
@@ -48,6 +53,13 @@ class CreatorProfile(models.Model):
     showcase_image_5 = models.URLField(blank=True, null=True)
     showcase_image_6 = models.URLField(blank=True, null=True)
 
+    class Meta:
+        # Creator discovery: filter by platform / moderation state, keyset on (followers_count, id)
+        indexes = [
+            models.Index(Upper("primary_platform"), "followers_count", "id", name="creator_platform_followers_idx"),
+            models.Index(fields=["banned", "followers_count", "id"], name="creator_state_followers_idx"),
+        ]
+
     def __str__(self):
         return f"Creator: {self.user.username}"
     
@@ -81,6 +93,38 @@ class Project(models.Model):
     budget = models.DecimalField(max_digits=10, decimal_places=2)
     deadline = models.DateField()
     created_at = models.DateTimeField(auto_now_add=True)
+    # Maintained by a database trigger on PostgreSQL (see migration 0004); unused on SQLite
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Normalized from skills_required on save (accounts.skills)
+    skills = models.ManyToManyField("SkillTag", through="ProjectSkill", related_name="projects", blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["budget", "id"], name="project_budget_idx"),
+            models.Index(fields=["deadline", "id"], name="project_deadline_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        # The brand's budget ledger is written by signal handlers (accounts.budget) in the same transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+class SkillTag(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
+class ProjectSkill(models.Model):
+    project = models.ForeignKey(Project, on_delete=models.CASCADE)
+    tag = models.ForeignKey(SkillTag, on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            # Leading tag column: "projects with tag X" is an index-only scan
+            models.UniqueConstraint(fields=["tag", "project"], name="project_skill_tag_uniq"),
+        ]
 
 class Application(models.Model):
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="applications")
@@ -89,6 +133,50 @@ class Application(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     status = models.CharField(max_length=10, choices=(('pending','Pending'),('hired','Hired'),('rejected','Rejected')), default='pending')
 
+    def save(self, *args, **kwargs):
+        # Hiring commits budget in the brand's ledger (accounts.budget); keep both in one transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class BrandBudget(models.Model):
+    """
+    Running budget totals per brand, kept by accounts.budget.
+    committed counts each hired application at its project's budget.
+    """
+    brand = models.OneToOneField(User, on_delete=models.CASCADE, related_name="budget_ledger")
+    allocated = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    committed = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def available(self):
+        return self.allocated - self.committed
+
+
+class BudgetLedgerEntry(models.Model):
+    """
+    Append-only history behind BrandBudget: one signed delta per change.
+    project has no DB constraint so entries outlive deleted projects.
+    """
+    ALLOCATE = "allocate"
+    COMMIT = "commit"
+    KIND_CHOICES = [(ALLOCATE, "Allocate"), (COMMIT, "Commit")]
+
+    brand = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    project = models.ForeignKey(
+        Project, on_delete=models.DO_NOTHING, db_constraint=False, null=True, blank=True, related_name="+"
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    amount = models.DecimalField(max_digits=14, decimal_places=2)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["brand", "created_at"], name="budget_entry_brand_time_idx"),
+            models.Index(fields=["brand", "project"], name="budget_entry_brand_proj_idx"),
+        ]
+
 
 class Notification(models.Model):
     recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
@@ -96,6 +184,13 @@ class Notification(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     is_read = models.BooleanField(default=False)
     data = models.JSONField(null=True, blank=True)  # 👈 add this
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["recipient", "created_at", "id"], name="notification_recipient_idx"),
+            models.Index(fields=["recipient"], condition=models.Q(is_read=False), name="notification_unread_idx"),
+        ]
+
     def __str__(self):
         return f"{self.recipient.username} - {self.message}"
 
@@ -107,6 +202,12 @@ class Review(models.Model):
     review_text = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    def save(self, *args, **kwargs):
+        # The reviewee's rating_sum/rating_count are adjusted by signal handlers (accounts.ratings)
+        # and must commit or roll back together with the review itself
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     def __str__(self):
         return f"Review by {self.reviewer.username} for {self.reviewee.username}: {self.rating} stars"
 
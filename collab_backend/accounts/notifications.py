@@ -0,0 +1,74 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache_versions import bump_version, get_or_compute
+from .models import Notification
+
+UNREAD_CACHE_TTL = getattr(settings, "NOTIFICATION_UNREAD_CACHE_TTL", 300)
+
+
+def unread_cache_key(user_id):
+    return f"notifications_unread:{user_id}"
+
+
+def adjust_unread(user_id, delta):
+    """
+    Move a cached unread counter by `delta` once the surrounding
+    transaction commits. A missing key is left missing: the next read
+    recounts it. The version bump tells a recount running concurrently
+    that its result may already be stale.
+    """
+    if not delta:
+        return
+    key = unread_cache_key(user_id)
+
+    def apply():
+        bump_version(key, UNREAD_CACHE_TTL)
+        try:
+            if cache.incr(key, delta) < 0:
+                cache.delete(key)
+        except ValueError:
+            pass
+
+    transaction.on_commit(apply)
+
+
+def unread_count(user_id):
+    """
+    Cached number of unread notifications. A miss costs one COUNT over
+    the partial (recipient) WHERE NOT is_read index.
+
+    Writers bump the key's version before their incr, so a recount that
+    raced a committing write is not left cached (see cache_versions).
+    """
+    return get_or_compute(
+        unread_cache_key(user_id),
+        lambda: Notification.objects.filter(recipient_id=user_id, is_read=False).count(),
+        UNREAD_CACHE_TTL,
+    )
+
+
+def mark_read(user_id, **filters):
+    """
+    Mark the user's unread notifications matching `filters` as read in a
+    single UPDATE and take the same number off the cached counter.
+    Returns how many were marked.
+    """
+    marked = Notification.objects.filter(recipient_id=user_id, is_read=False, **filters).update(is_read=True)
+    adjust_unread(user_id, -marked)
+    return marked
+
+
+@receiver(post_save, sender=Notification)
+def count_new_notification(sender, instance, created, **kwargs):
+    if created and not instance.is_read:
+        adjust_unread(instance.recipient_id, 1)
+
+
+@receiver(post_delete, sender=Notification)
+def uncount_deleted_notification(sender, instance, **kwargs):
+    if not instance.is_read:
+        adjust_unread(instance.recipient_id, -1)
@@ -0,0 +1,37 @@
+import base64
+import json
+
+from rest_framework.pagination import PageNumberPagination
+
+
+class BoundedPageNumberPagination(PageNumberPagination):
+    """
+    ?page=N&page_size=M, with page_size capped so one request can never
+    pull the whole table.
+    """
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+def encode_keyset(*values):
+    """
+    Opaque keyset cursor for the sort-key values of the last row on a page.
+    """
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_keyset(token, size):
+    """
+    Inverse of encode_keyset: a list of `size` values, or raises ValueError.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
@@ -0,0 +1,158 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache_versions import bump_version, discard_changed, read_versions
+from .identity import identity_cache
+from .models import Review
+
+User = get_user_model()
+
+STARS = range(1, 6)
+SUMMARY_CACHE_TTL = getattr(settings, "RATING_SUMMARY_CACHE_TTL", 30)
+
+
+def summary_cache_key(user_id):
+    return f"rating_summary:{user_id}"
+
+
+def adjust_rating(user_id, delta_sum, delta_count):
+    """
+    Apply a review delta to a user's running totals with a single
+    UPDATE ... SET rating_sum = rating_sum + x, so concurrent reviews
+    never overwrite each other.
+    """
+    if user_id is None or (delta_sum == 0 and delta_count == 0):
+        return
+    User.objects.filter(pk=user_id).update(
+        rating_sum=F("rating_sum") + delta_sum,
+        rating_count=F("rating_count") + delta_count,
+    )
+    key = summary_cache_key(user_id)
+
+    def invalidate():
+        # The version bump also stops a summary already in flight from caching
+        bump_version(key, SUMMARY_CACHE_TTL)
+        cache.delete(key)
+        # update() sends no post_save, so the cached identity is dropped here too
+        identity_cache.invalidate(user_id)
+
+    # After commit, so a concurrent read cannot re-cache the pre-write totals
+    transaction.on_commit(invalidate)
+
+
+# Review.save() runs in transaction.atomic(), so the snapshot's row lock
+# makes a concurrent edit of the same review wait instead of computing its
+# delta from the same "before" rating.
+
+@receiver(pre_save, sender=Review)
+def remember_previous_rating(sender, instance, **kwargs):
+    instance._rating_before = None
+    if instance.pk is not None:
+        instance._rating_before = (
+            Review.objects.select_for_update().filter(pk=instance.pk).values_list("reviewee_id", "rating").first()
+        )
+
+
+@receiver(post_save, sender=Review)
+def apply_saved_rating(sender, instance, created, **kwargs):
+    before = getattr(instance, "_rating_before", None)
+    if before is None:
+        adjust_rating(instance.reviewee_id, instance.rating, 1)
+        return
+
+    old_reviewee_id, old_rating = before
+    if old_reviewee_id == instance.reviewee_id:
+        adjust_rating(instance.reviewee_id, instance.rating - old_rating, 0)
+    else:
+        adjust_rating(old_reviewee_id, -old_rating, -1)
+        adjust_rating(instance.reviewee_id, instance.rating, 1)
+
+
+@receiver(post_delete, sender=Review)
+def apply_deleted_rating(sender, instance, **kwargs):
+    adjust_rating(instance.reviewee_id, -instance.rating, -1)
+
+
+def rebuild_ratings(chunk_size=1000, dry_run=False):
+    """
+    Recompute every user's rating_sum/rating_count from Review and write
+    back only the rows that drifted. Returns the list of
+    (user_id, stored, actual) mismatches found.
+    """
+    actual = {
+        row["reviewee_id"]: (row["total"], row["count"])
+        for row in Review.objects.order_by()
+        .values("reviewee_id")
+        .annotate(total=Sum("rating"), count=Count("id"))
+    }
+
+    mismatches = []
+    stored = User.objects.order_by("id").values_list("id", "rating_sum", "rating_count")
+    for user_id, rating_sum, rating_count in stored.iterator(chunk_size=chunk_size):
+        expected = actual.get(user_id, (0, 0))
+        if (rating_sum, rating_count) != expected:
+            mismatches.append((user_id, (rating_sum, rating_count), expected))
+
+    if not dry_run:
+        for start in range(0, len(mismatches), chunk_size):
+            User.objects.bulk_update(
+                [
+                    User(id=user_id, rating_sum=expected[0], rating_count=expected[1])
+                    for user_id, _, expected in mismatches[start:start + chunk_size]
+                ],
+                ["rating_sum", "rating_count"],
+            )
+    return mismatches
+
+
+def empty_summary():
+    return {"average": 0.0, "count": 0, "histogram": {str(star): 0 for star in STARS}}
+
+
+def rating_summaries(user_ids):
+    """
+    {user_id: {"average", "count", "histogram"}} for every id in user_ids.
+
+    Cached summaries are served with one get_many; the rest come from a
+    single grouped aggregate over Review (one conditional COUNT per star)
+    and are cached for SUMMARY_CACHE_TTL seconds, unless a review write
+    committed meanwhile. Users without reviews get an empty summary.
+    """
+    keys = {summary_cache_key(user_id): user_id for user_id in user_ids}
+    cached = cache.get_many(list(keys))
+    summaries = {keys[key]: summary for key, summary in cached.items()}
+
+    missing = [user_id for user_id in user_ids if user_id not in summaries]
+    if missing:
+        missing_keys = [summary_cache_key(user_id) for user_id in missing]
+        versions = read_versions(missing_keys)
+        rows = (
+            Review.objects.filter(reviewee_id__in=missing)
+            .order_by()
+            .values("reviewee_id")
+            .annotate(
+                total=Sum("rating"),
+                count=Count("id"),
+                **{f"star_{star}": Count("id", filter=Q(rating=star)) for star in STARS},
+            )
+        )
+        fresh = {user_id: empty_summary() for user_id in missing}
+        for row in rows:
+            fresh[row["reviewee_id"]] = {
+                "average": round(row["total"] / row["count"], 2),
+                "count": row["count"],
+                "histogram": {str(star): row[f"star_{star}"] for star in STARS},
+            }
+        cache.set_many(
+            {summary_cache_key(user_id): summary for user_id, summary in fresh.items()},
+            SUMMARY_CACHE_TTL,
+        )
+        discard_changed(missing_keys, versions)
+        summaries.update(fresh)
+
+    return summaries
@@ -0,0 +1,44 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import Case, F, Q, Value, When
+
+from .models import Project
+
+SEARCH_CONFIG = "english"
+MAX_TERMS = 10
+
+# SQLite fallback: same A/B/C weighting the tsvector trigger applies
+FIELD_WEIGHTS = (("title", 1.0), ("skills_required", 0.4), ("description", 0.2))
+
+
+def search_projects(q, queryset=None):
+    """
+    Projects matching every term of `q` in title, skills_required or
+    description, annotated with a float `rank` (higher is better).
+
+    On PostgreSQL this is a websearch_to_tsquery match against the
+    trigger-maintained search_vector (GIN indexed) ranked with ts_rank.
+    Elsewhere it falls back to icontains per term with a weighted score.
+    """
+    if queryset is None:
+        queryset = Project.objects.all()
+
+    if connection.vendor == "postgresql":
+        query = SearchQuery(q, config=SEARCH_CONFIG, search_type="websearch")
+        return queryset.filter(search_vector=query).annotate(
+            rank=SearchRank(F("search_vector"), query)
+        )
+
+    rank = Value(0.0)
+    for term in q.split()[:MAX_TERMS]:
+        queryset = queryset.filter(
+            Q(title__icontains=term)
+            | Q(skills_required__icontains=term)
+            | Q(description__icontains=term)
+        )
+        for field, weight in FIELD_WEIGHTS:
+            rank = rank + Case(
+                When(**{f"{field}__icontains": term}, then=Value(weight)),
+                default=Value(0.0),
+            )
+    return queryset.annotate(rank=rank)
@@ -42,6 +42,28 @@ class CreatorProfileSerializer(serializers.ModelSerializer):
 
 
 
+class CreatorCardSerializer(serializers.ModelSerializer):
+    """
+    Compact creator row for discovery lists. `id` is the user id, as in
+    /creators/<id>/. Expects rating, review_count and bio_excerpt
+    annotations from creator_discover.
+    """
+    id = serializers.ReadOnlyField(source="user_id")
+    profile_id = serializers.ReadOnlyField(source="id")
+    username = serializers.ReadOnlyField(source="user.username")
+    bio = serializers.ReadOnlyField(source="bio_excerpt")
+    rating = serializers.ReadOnlyField()
+    review_count = serializers.ReadOnlyField()
+
+    class Meta:
+        model = CreatorProfile
+        fields = [
+            "id", "profile_id", "username", "full_name", "username_handle", "primary_platform",
+            "followers_count", "profile_image", "approved", "bio", "rating", "review_count",
+        ]
+
+
+
 class BrandProfileSerializer(serializers.ModelSerializer):
     projects_count = serializers.SerializerMethodField()
 
@@ -51,8 +73,31 @@ class BrandProfileSerializer(serializers.ModelSerializer):
         read_only_fields = ['user']
 
     def get_projects_count(self, obj):
+        # Annotated by brand_profiles(); plain profile views fall back to a COUNT
+        if hasattr(obj, "project_total"):
+            return obj.project_total
         return obj.user.projects.count()
 
+
+class BrandCardSerializer(serializers.ModelSerializer):
+    """
+    Compact brand row for the directory. `id` is the user id, as in
+    /brands/<id>/. Expects the brand_profiles() annotations.
+    """
+    id = serializers.ReadOnlyField(source="user_id")
+    profile_id = serializers.ReadOnlyField(source="id")
+    username = serializers.ReadOnlyField(source="user.username")
+    description = serializers.ReadOnlyField(source="description_excerpt")
+    projects_count = serializers.ReadOnlyField(source="project_total")
+    open_projects_count = serializers.ReadOnlyField(source="open_project_total")
+
+    class Meta:
+        model = BrandProfile
+        fields = [
+            "id", "profile_id", "username", "brand_name", "website_social", "profile_image",
+            "approved", "description", "projects_count", "open_projects_count",
+        ]
+
 class CollaborationMiniSerializer(serializers.ModelSerializer):
     class Meta:
         model = Collaboration
@@ -65,9 +110,20 @@ class ProjectSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Project
-        fields = '__all__'
+        exclude = ['search_vector', 'skills']
         read_only_fields = ['brand', 'created_at']
 
+class ProjectListSerializer(serializers.ModelSerializer):
+    """
+    Project card for list endpoints: ProjectSerializer without the nested
+    collaborations. Lists return it unless ?expand=collaborations is given.
+    """
+
+    class Meta:
+        model = Project
+        fields = ["id", "brand", "title", "description", "skills_required", "budget", "deadline", "created_at"]
+        read_only_fields = fields
+
 class ApplicationSerializer(serializers.ModelSerializer):
     creator_name = serializers.CharField(source='creator.creatorprofile.full_name', read_only=True)
     creator_followers = serializers.IntegerField(source='creator.creatorprofile.followers_count', read_only=True)
@@ -144,25 +200,13 @@ class LockSerializer(serializers.Serializer):
 
 
 class CreatorProjectViewSerializer(serializers.ModelSerializer):
-    status = serializers.SerializerMethodField()
-    collaboration_id = serializers.SerializerMethodField()
+    """
+    Expects the queryset from CreatorProjectView, which annotates the
+    requesting creator's application_status and collaboration_id.
+    """
+    status = serializers.ReadOnlyField(source="application_status")
+    collaboration_id = serializers.ReadOnlyField()
 
     class Meta:
         model = Project
         fields = ["id", "title", "description", "budget", "status", "collaboration_id"]
-
-    def get_status(self, project):
-        user = self.context["request"].user
-        app = Application.objects.filter(
-            project=project,
-            creator=user
-        ).first()
-        return app.status if app else None
-
-    def get_collaboration_id(self, project):
-        user = self.context["request"].user
-        collab = Collaboration.objects.filter(
-            project=project,
-            creator=user
-        ).first()
-        return collab.id if collab else None
@@ -0,0 +1,104 @@
+import re
+
+from django.db.models import Count, Q
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Project, ProjectSkill, SkillTag
+
+SKILL_SEPARATORS = re.compile(r"[,;/|\n]+")
+MAX_SKILL_LENGTH = 50
+
+# (label, lower bound inclusive, upper bound exclusive)
+BUDGET_BUCKETS = (
+    ("0-500", None, 500),
+    ("500-1000", 500, 1000),
+    ("1000-5000", 1000, 5000),
+    ("5000+", 5000, None),
+)
+MAX_SKILL_FACETS = 20
+
+
+def parse_skills(text):
+    """
+    "Video Editing, UGC / reels" -> ["video editing", "ugc", "reels"]
+    """
+    names = []
+    for raw in SKILL_SEPARATORS.split(text or ""):
+        name = " ".join(raw.split()).lower()[:MAX_SKILL_LENGTH]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def sync_project_skills(project):
+    names = parse_skills(project.skills_required)
+    SkillTag.objects.bulk_create([SkillTag(name=name) for name in names], ignore_conflicts=True)
+    project.skills.set(SkillTag.objects.filter(name__in=names))
+
+
+@receiver(pre_save, sender=Project)
+def remember_previous_skills(sender, instance, update_fields=None, **kwargs):
+    instance._skills_before = None
+    if instance.pk is not None and (update_fields is None or "skills_required" in update_fields):
+        instance._skills_before = Project.objects.filter(pk=instance.pk).values_list("skills_required", flat=True).first()
+
+
+@receiver(post_save, sender=Project)
+def sync_skills_on_save(sender, instance, created, update_fields=None, **kwargs):
+    # A full save() that leaves skills_required as stored keeps the tags too
+    if update_fields is not None and "skills_required" not in update_fields:
+        return
+    if created or getattr(instance, "_skills_before", None) != instance.skills_required:
+        sync_project_skills(instance)
+
+
+def filter_by_skills(projects, names):
+    """
+    Projects tagged with every one of `names` (already normalized with
+    parse_skills). The intersection is a single
+    GROUP BY over ProjectSkill's (tag, project) index.
+    """
+    if not names:
+        return projects
+    matching = (
+        ProjectSkill.objects.filter(tag__name__in=names)
+        .values("project_id")
+        .annotate(matched=Count("tag_id"))
+        .filter(matched=len(names))
+        .values("project_id")
+    )
+    return projects.filter(id__in=matching)
+
+
+def skill_facets(projects):
+    """
+    [{"name", "count"}] for the most common tags among `projects`.
+    """
+    rows = (
+        ProjectSkill.objects.filter(project_id__in=projects.values("id"))
+        .values("tag__name")
+        .annotate(count=Count("project_id"))
+        .order_by("-count", "tag__name")[:MAX_SKILL_FACETS]
+    )
+    return [{"name": row["tag__name"], "count": row["count"]} for row in rows]
+
+
+def budget_facets(projects):
+    """
+    [{"bucket", "count"}] for BUDGET_BUCKETS, in one conditional aggregate.
+    """
+    aggregates = {}
+    for index, (_, low, high) in enumerate(BUDGET_BUCKETS):
+        condition = Q()
+        if low is not None:
+            condition &= Q(budget__gte=low)
+        if high is not None:
+            condition &= Q(budget__lt=high)
+        aggregates[f"bucket_{index}"] = Count("id", filter=condition)
+
+    counts = projects.order_by().aggregate(**aggregates)
+    return [
+        {"bucket": label, "count": counts[f"bucket_{index}"]}
+        for index, (label, _, _) in enumerate(BUDGET_BUCKETS)
+    ]
@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache_versions import bump_version, get_or_compute
+from .models import Application
+
+STATS_CACHE_TTL = getattr(settings, "CREATOR_STATS_CACHE_TTL", 300)
+APPLICATION_STATUSES = ("pending", "hired", "rejected")
+
+
+def stats_cache_key(creator_id):
+    return f"creator_stats:{creator_id}"
+
+
+def compute_creator_stats(creator_id):
+    """
+    applied/pending/hired/rejected in a single conditional aggregate.
+    """
+    return Application.objects.filter(creator_id=creator_id).aggregate(
+        applied=Count("id"),
+        **{status: Count("id", filter=Q(status=status)) for status in APPLICATION_STATUSES},
+    )
+
+
+def creator_stats_for(creator_id):
+    """
+    Cached compute_creator_stats(); Application saves and deletes drop the
+    entry after commit, so the TTL only bounds staleness from writes that
+    bypass signals.
+    """
+    return get_or_compute(stats_cache_key(creator_id), lambda: compute_creator_stats(creator_id), STATS_CACHE_TTL)
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def invalidate_creator_stats(sender, instance, **kwargs):
+    key = stats_cache_key(instance.creator_id)
+
+    def invalidate():
+        # The version bump also stops a recount already in flight from caching
+        bump_version(key, STATS_CACHE_TTL)
+        cache.delete(key)
+
+    transaction.on_commit(invalidate)
@@ -1,3 +1,221 @@
+import datetime
+from decimal import Decimal
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from .budget import budget_summary, reconcile_budgets
+from .models import Application, BrandBudget, BudgetLedgerEntry, Project, Review, User
+from .ratings import rebuild_ratings
+
+
+class BudgetLedgerTests(TestCase):
+    """
+    Every write path must leave BrandBudget equal to the totals
+    reconcile_budgets() recomputes from Project and hired Application.
+    """
+
+    def setUp(self):
+        self.brand = User.objects.create(username="brand", email="brand@test.local", role="brand")
+        self.creator = User.objects.create(username="creator", email="creator@test.local", role="creator")
+
+    def make_project(self, budget, brand=None):
+        return Project.objects.create(
+            brand=brand or self.brand,
+            title="Launch",
+            description="d",
+            skills_required="video",
+            budget=budget,
+            deadline=datetime.date(2030, 1, 1),
+        )
+
+    def hire(self, project, creator=None):
+        return Application.objects.create(project=project, creator=creator or self.creator, pitch="p", status="hired")
+
+    def assertLedger(self, brand, allocated, committed):
+        self.assertEqual(reconcile_budgets(), [])
+        summary = budget_summary(brand.id)
+        self.assertEqual(summary["total_allocated"], Decimal(allocated))
+        self.assertEqual(summary["committed"], Decimal(committed))
+        self.assertEqual(summary["available"], Decimal(allocated) - Decimal(committed))
+
+    def test_create_and_edit_budget(self):
+        project = self.make_project(100)
+        self.assertLedger(self.brand, 100, 0)
+
+        project.budget = 250
+        project.save()
+        self.assertLedger(self.brand, 250, 0)
+
+    def test_edit_moves_commitment_per_hire(self):
+        project = self.make_project(100)
+        other = User.objects.create(username="other", email="other@test.local", role="creator")
+        self.hire(project)
+        self.hire(project, other)
+        self.assertLedger(self.brand, 100, 200)
+
+        project.budget = 150
+        project.save()
+        self.assertLedger(self.brand, 150, 300)
+
+    def test_brand_move(self):
+        new_brand = User.objects.create(username="brand2", email="brand2@test.local", role="brand")
+        project = self.make_project(100)
+        self.hire(project)
+
+        project.brand = new_brand
+        project.save()
+        self.assertLedger(self.brand, 0, 0)
+        self.assertLedger(new_brand, 100, 100)
+
+    def test_hire_and_unhire(self):
+        project = self.make_project(100)
+        application = Application.objects.create(project=project, creator=self.creator, pitch="p")
+        self.assertLedger(self.brand, 100, 0)
+
+        application.status = "hired"
+        application.save()
+        self.assertLedger(self.brand, 100, 100)
+
+        application.save()
+        self.assertLedger(self.brand, 100, 100)
+
+        application.status = "rejected"
+        application.save()
+        self.assertLedger(self.brand, 100, 0)
+
+    def test_application_delete(self):
+        project = self.make_project(100)
+        self.hire(project).delete()
+        self.assertLedger(self.brand, 100, 0)
+
+    def test_project_delete_cascades_hires(self):
+        keep = self.make_project(40)
+        project = self.make_project(100)
+        self.hire(project)
+        self.hire(keep)
+
+        project.delete()
+        self.assertLedger(self.brand, 40, 40)
+
+    def test_creator_delete_cascades_hires(self):
+        project = self.make_project(100)
+        self.hire(project)
+
+        self.creator.delete()
+        self.assertLedger(self.brand, 100, 0)
+
+    def test_brand_delete_drops_ledger(self):
+        self.hire(self.make_project(100))
+
+        self.brand.delete()
+        self.assertEqual(reconcile_budgets(), [])
+        self.assertFalse(BrandBudget.objects.exists())
+        self.assertFalse(BudgetLedgerEntry.objects.exists())
+
+    def test_reconcile_fixes_drift(self):
+        project = self.make_project(100)
+        Application.objects.create(project=project, creator=self.creator, pitch="p")
+        # update() bypasses the signal handlers, like a raw SQL fix would
+        Application.objects.update(status="hired")
+
+        self.assertEqual(len(reconcile_budgets()), 1)
+        reconcile_budgets(fix=True)
+        self.assertLedger(self.brand, 100, 100)
+
+
+class SkillSyncTests(TestCase):
+    def setUp(self):
+        brand = User.objects.create(username="brand", email="brand@test.local", role="brand")
+        self.project = Project.objects.create(
+            brand=brand,
+            title="Launch",
+            description="d",
+            skills_required="Video, UGC",
+            budget=100,
+            deadline=datetime.date(2030, 1, 1),
+        )
+
+    def skill_names(self):
+        return sorted(self.project.skills.values_list("name", flat=True))
+
+    def test_create_tags_skills(self):
+        self.assertEqual(self.skill_names(), ["ugc", "video"])
+
+    def test_edit_resyncs_skills(self):
+        self.project.skills_required = "reels"
+        self.project.save()
+        self.assertEqual(self.skill_names(), ["reels"])
+
+    def test_unchanged_skills_skip_sync(self):
+        self.project.title = "Relaunch"
+        with CaptureQueriesContext(connection) as queries:
+            self.project.save()
+        self.assertFalse(any("skilltag" in query["sql"].lower() for query in queries.captured_queries))
+        self.assertEqual(self.skill_names(), ["ugc", "video"])
+
+
+class RatingTotalsTests(TestCase):
+    """
+    Every Review write must leave User.rating_sum/rating_count equal to
+    what rebuild_ratings() recomputes from Review.
+    """
+
+    def setUp(self):
+        self.reviewer = User.objects.create(username="brand", email="brand@test.local", role="brand")
+        self.creator = User.objects.create(username="creator", email="creator@test.local", role="creator")
+
+    def review(self, rating, reviewee=None):
+        return Review.objects.create(reviewer=self.reviewer, reviewee=reviewee or self.creator, rating=rating)
+
+    def assertTotals(self, user, rating_sum, rating_count):
+        self.assertEqual(rebuild_ratings(dry_run=True), [])
+        user.refresh_from_db()
+        self.assertEqual((user.rating_sum, user.rating_count), (rating_sum, rating_count))
+
+    def test_create(self):
+        self.review(4)
+        self.review(2)
+        self.assertTotals(self.creator, 6, 2)
+
+    def test_edit(self):
+        review = self.review(4)
+        review.rating = 1
+        review.save()
+        self.assertTotals(self.creator, 1, 1)
+
+        review.save()
+        self.assertTotals(self.creator, 1, 1)
+
+    def test_reviewee_change(self):
+        other = User.objects.create(username="other", email="other@test.local", role="creator")
+        review = self.review(5)
+
+        review.reviewee = other
+        review.rating = 3
+        review.save()
+        self.assertTotals(self.creator, 0, 0)
+        self.assertTotals(other, 3, 1)
+
+    def test_delete(self):
+        keep = self.review(5)
+        self.review(2).delete()
+        self.assertTotals(self.creator, 5, 1)
+
+        keep.delete()
+        self.assertTotals(self.creator, 0, 0)
+
+    def test_reviewer_delete_cascades_reviews(self):
+        self.review(4)
+        self.reviewer.delete()
+        self.assertTotals(self.creator, 0, 0)
+
+    def test_rebuild_fixes_drift(self):
+        self.review(4)
+        # update() bypasses the signal handlers, like a raw SQL fix would
+        Review.objects.update(rating=2)
 
-# Create your tests here.
+        self.assertEqual(rebuild_ratings(dry_run=True), [(self.creator.id, (4, 1), (2, 1))])
+        rebuild_ratings()
+        self.assertTotals(self.creator, 2, 1)
@@ -16,6 +16,7 @@ urlpatterns = [
 
     # 🧱 Projects
     path("projects/", ProjectListView.as_view(), name="project-list"),             # ✅ All projects (for all users)
+    path("projects/search/", project_search, name="project-search"),
     path("projects/create/", ProjectCreateView.as_view(), name="project-create"),  # ✅ Brand can create new project
     path("projects/<int:pk>/", ProjectDetailView.as_view(), name="project-detail"), # ✅ Project detail
 
@@ -25,6 +26,7 @@ urlpatterns = [
     path("brands/<int:pk>/projects/", BrandProjectsView.as_view(), name="brand-projects"),  # ✅ Projects by a specific brand
 
     path("creators/", CreatorListView.as_view(), name="creator-list"),             # ✅ List all creators
+    path("creators/discover/", creator_discover, name="creator-discover"),
     path("creators/<int:pk>/", CreatorDetailView.as_view(), name="creator-detail"), # ✅ Creator detail
 
     # 📬 Applications
@@ -35,6 +37,8 @@ urlpatterns = [
 
     # 🔔 Notifications
     path("notifications/", NotificationListView.as_view(), name="notifications"),
+    path("notifications/unread-count/", notifications_unread_count, name="notifications-unread-count"),
+    path("notifications/<int:pk>/read/", mark_notification_read, name="notification-read"),
 
     # ⭐ Reviews
     path("reviews/", ReviewViewSet.as_view({'get': 'list', 'post': 'create'}), name="reviews"),
@@ -44,6 +48,7 @@ urlpatterns = [
         'patch': 'partial_update',
         'delete': 'destroy'
     }), name="review-detail"),
+    path("reviews/ratings/", ReviewViewSet.as_view({'get': 'batch_ratings'}), name="batch-ratings"),
     path("reviews/average-rating/<int:user_id>/", ReviewViewSet.as_view({'get': 'average_rating'}), name="average-rating"),
     path("guest/register/", GuestRegisterView.as_view(), name="guest-register"),
     path('collaborations/', CollaborationListView.as_view(), name='collaboration-list'),
@@ -75,6 +80,8 @@ path("projects/creator-view/", CreatorProjectView.as_view()),
 path("applications/withdraw/<int:project_id>/", withdraw_application),
 path("brand-profile/showcase/", BrandShowcaseUpdateView.as_view()),
 path("brand/budget-summary/", brand_budget_summary),
+path("brand/budget-summary/projects/", brand_budget_projects),
+path("brand/budget-summary/monthly/", brand_budget_monthly),
 path("brand-profile/image/", BrandProfileImageUpdateView.as_view())
 
 
@@ -1,4 +1,6 @@
 from django.contrib.auth import authenticate, get_user_model
+from django.db.models import Case, Count, F, FloatField, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Cast, Coalesce, Substr, Upper
 from rest_framework import generics, permissions, status, viewsets
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -8,7 +10,18 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from .models import GuestUser
 from .models import *
 from .serializers import *
-from chat.models import ChatMessage
+from .budget import budget_summary, monthly_series, project_breakdown
+from .notifications import mark_read, unread_count
+from .pagination import BoundedPageNumberPagination, decode_keyset, encode_keyset
+from .ratings import rating_summaries
+from .search import search_projects
+from .skills import budget_facets, filter_by_skills, parse_skills, skill_facets
+from .stats import creator_stats_for
+from chat.pagination import decode_cursor, encode_cursor, parse_limit
+from decimal import Decimal, InvalidOperation
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from chat.conversations import send_message
 
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
@@ -92,9 +105,13 @@ class CreatorProfileView(generics.RetrieveUpdateAPIView):
 
     def get_object(self):
         user = self.request.user
-        if hasattr(user, "creatorprofile"):
-            return user.creatorprofile
-        raise NotFound("No creator profile found for this user.")
+        try:
+            if self.request.method in permissions.SAFE_METHODS:
+                return user.creatorprofile
+            # Updates save every field: start from the current row, not the cached identity
+            return CreatorProfile.objects.get(user=user)
+        except CreatorProfile.DoesNotExist:
+            raise NotFound("No creator profile found for this user.")
 
 
 class BrandProfileView(generics.RetrieveUpdateAPIView):
@@ -102,9 +119,14 @@ class BrandProfileView(generics.RetrieveUpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
-        if hasattr(self.request.user, "brandprofile"):
-            return self.request.user.brandprofile
-        raise NotFound("No brand profile found for this user.")
+        user = self.request.user
+        try:
+            if self.request.method in permissions.SAFE_METHODS:
+                return user.brandprofile
+            # Updates save every field: start from the current row, not the cached identity
+            return BrandProfile.objects.get(user=user)
+        except BrandProfile.DoesNotExist:
+            raise NotFound("No brand profile found for this user.")
 
 
 # ---------------------------
@@ -119,31 +141,128 @@ class ProjectCreateView(generics.CreateAPIView):
         serializer.save(brand=self.request.user)
 
 
-class ProjectListView(generics.ListAPIView):
+class ProjectListMixin:
+    """
+    Paginated project lists. Rows use ProjectListSerializer unless the
+    client asks for ?expand=collaborations, in which case the nested
+    collaborations are loaded with one prefetch query for the whole page.
+    """
+    pagination_class = BoundedPageNumberPagination
+
+    def expand_collaborations(self):
+        return "collaborations" in self.request.query_params.get("expand", "").split(",")
+
+    def get_serializer_class(self):
+        if self.expand_collaborations():
+            return ProjectSerializer
+        return ProjectListSerializer
+
+    def get_queryset(self):
+        queryset = self.get_project_queryset().defer("search_vector")
+        if self.expand_collaborations():
+            queryset = queryset.prefetch_related("collaborations")
+        return queryset.order_by("-id")
+
+
+class ProjectListView(ProjectListMixin, generics.ListAPIView):
     """
     ✅ Shows all projects to everyone (creators & brands)
     """
-    serializer_class = ProjectSerializer
     permission_classes = [permissions.AllowAny]  # public view
 
-    def get_queryset(self):
-        return Project.objects.all().select_related("brand").order_by("-id")
+    def get_project_queryset(self):
+        return Project.objects.all()
 
 
-class MyProjectListView(generics.ListAPIView):
+class MyProjectListView(ProjectListMixin, generics.ListAPIView):
     """
     ✅ Shows only the logged-in brand's own projects
     """
-    serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_queryset(self):
-        user = self.request.user
-        return Project.objects.filter(brand=user).order_by("-id")
+    def get_project_queryset(self):
+        return Project.objects.filter(brand=self.request.user)
+
+
+@api_view(["GET"])
+@permission_classes([permissions.AllowAny])
+def project_search(request):
+    """
+    GET /api/projects/search/?q=&skills=&budget_min=&budget_max=&deadline_after=&deadline_before=&facets=&limit=&cursor=
+
+    Full-text search over title, skills and description combined with
+    budget/deadline range filters and a comma separated skills filter
+    (projects must carry every tag). Results are ordered by relevance (or
+    newest first without q) and keyset paginated: pass next_cursor back
+    as ?cursor= for the following page. ?facets=true adds per-skill and
+    per-budget-bucket counts over the whole filtered result set.
+    """
+    params = request.query_params
+    q = params.get("q", "").strip()
+    limit = parse_limit(params.get("limit"), default=20, maximum=100)
+
+    projects = Project.objects.defer("search_vector")
+    if q:
+        projects = search_projects(q, projects)
+
+    try:
+        if params.get("budget_min"):
+            projects = projects.filter(budget__gte=Decimal(params["budget_min"]))
+        if params.get("budget_max"):
+            projects = projects.filter(budget__lte=Decimal(params["budget_max"]))
+        for name, lookup in (("deadline_after", "deadline__gte"), ("deadline_before", "deadline__lte")):
+            if params.get(name):
+                value = parse_date(params[name])
+                if value is None:
+                    raise ValueError(name)
+                projects = projects.filter(**{lookup: value})
+    except (InvalidOperation, ValueError):
+        return Response({"error": "Invalid budget or deadline filter"}, status=400)
+
+    if params.get("skills"):
+        projects = filter_by_skills(projects, parse_skills(params["skills"]))
+
+    facets = None
+    if params.get("facets") == "true":
+        facets = {"skills": skill_facets(projects), "budget": budget_facets(projects)}
+
+    cursor = params.get("cursor")
+    if cursor:
+        try:
+            if q:
+                rank, last_id = decode_keyset(cursor, 2)
+                projects = projects.filter(
+                    Q(rank__lt=float(rank)) | Q(rank=float(rank), id__lt=int(last_id))
+                )
+            else:
+                (last_id,) = decode_keyset(cursor, 1)
+                projects = projects.filter(id__lt=int(last_id))
+        except (TypeError, ValueError):
+            return Response({"error": "Invalid cursor"}, status=400)
+
+    ordering = ("-rank", "-id") if q else ("-id",)
+    rows = list(projects.order_by(*ordering)[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    results = ProjectListSerializer(rows, many=True).data
+    if q:
+        for item, project in zip(results, rows):
+            item["rank"] = project.rank
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_keyset(last.rank, last.id) if q else encode_keyset(last.id)
+
+    data = {"results": results, "next_cursor": next_cursor, "has_more": has_more}
+    if facets is not None:
+        data["facets"] = facets
+    return Response(data)
 
 
 class ProjectDetailView(generics.RetrieveAPIView):
-    queryset = Project.objects.all()
+    queryset = Project.objects.defer("search_vector").prefetch_related("collaborations")
     serializer_class = ProjectSerializer
     permission_classes = [permissions.AllowAny]
 
@@ -291,18 +410,73 @@ class ApplicationRejectView(APIView):
 # ---------------------------
 
 class NotificationListView(generics.ListAPIView):
+    """
+    GET /api/notifications/?unread=&limit=&cursor=
+    Newest first, keyset paginated on (created_at, id) via next_cursor so
+    each page is one range scan of the recipient index however long the
+    history grows.
+    """
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         user = self.request.user
-        return Notification.objects.filter(recipient=user).order_by('-created_at')
+        notifications = Notification.objects.filter(recipient=user)
+        if self.request.query_params.get("unread") == "true":
+            notifications = notifications.filter(is_read=False)
+        return notifications.order_by("-created_at", "-id")
+
+    def list(self, request, *args, **kwargs):
+        params = request.query_params
+        limit = parse_limit(params.get("limit"), default=20, maximum=100)
+        notifications = self.get_queryset()
+
+        if params.get("cursor"):
+            try:
+                before_at, before_id = decode_cursor(params["cursor"])
+            except ValueError:
+                return Response({"error": "Invalid cursor"}, status=400)
+            notifications = notifications.filter(
+                Q(created_at__lt=before_at) | Q(created_at=before_at, id__lt=before_id)
+            )
+
+        rows = list(notifications[:limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        return Response({
+            "results": self.get_serializer(rows, many=True).data,
+            "next_cursor": encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None,
+            "has_more": has_more,
+        })
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def notifications_unread_count(request):
+    """
+    GET /api/notifications/unread-count/
+    Badge counter served from cache; a miss recounts once.
+    """
+    return Response({"unread": unread_count(request.user.id)})
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def mark_notification_read(request, pk):
+    if not Notification.objects.filter(pk=pk, recipient=request.user).exists():
+        return Response({"error": "Notification not found"}, status=404)
+    mark_read(request.user.id, pk=pk)
+    return Response({"success": True, "unread": unread_count(request.user.id)})
 
 
 # ---------------------------
 # REVIEWS
 # ---------------------------
 
+MAX_RATING_BATCH = 300
+
+
 class ReviewViewSet(viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -319,16 +493,34 @@ class ReviewViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], url_path='average-rating/(?P<user_id>\d+)')
     def average_rating(self, request, user_id=None):
         try:
-            user = User.objects.get(id=user_id)
-            avg_rating = user.average_rating
-            review_count = user.reviews_received.count()
+            user = User.objects.only("rating_sum", "rating_count").get(id=user_id)
             return Response({
-                'average_rating': avg_rating,
-                'review_count': review_count
+                'average_rating': user.average_rating,
+                'review_count': user.rating_count
             })
         except User.DoesNotExist:
             return Response({'error': 'User not found'}, status=404)
 
+    @action(detail=False, methods=['get'], url_path='ratings')
+    def batch_ratings(self, request):
+        """
+        GET /api/reviews/ratings/?ids=1,2,3 -> average, count and 1-5 star
+        histogram for up to MAX_RATING_BATCH users in one request.
+        """
+        try:
+            user_ids = list(dict.fromkeys(
+                int(value) for value in request.query_params.get('ids', '').split(',') if value.strip()
+            ))
+        except ValueError:
+            return Response({'error': 'ids must be a comma separated list of user ids'}, status=400)
+        if not user_ids:
+            return Response({'error': 'ids is required'}, status=400)
+        if len(user_ids) > MAX_RATING_BATCH:
+            return Response({'error': f'At most {MAX_RATING_BATCH} ids per request'}, status=400)
+
+        summaries = rating_summaries(user_ids)
+        return Response({'results': {str(user_id): summaries[user_id] for user_id in user_ids}})
+
 
 # ---------------------------
 # LIST VIEWS (ALL CREATORS / BRANDS)
@@ -342,12 +534,129 @@ class CreatorListView(generics.ListAPIView):
         return User.objects.filter(role='creator')
 
 
+CREATOR_SORTS = {
+    "followers": "followers_count",
+    "rating": "rating",
+}
+BIO_EXCERPT_LENGTH = 160
+
+
+@api_view(["GET"])
+@permission_classes([permissions.AllowAny])
+def creator_discover(request):
+    """
+    GET /api/creators/discover/?platform=&followers_min=&followers_max=&approved=&banned=&min_rating=&sort=&limit=&cursor=
+
+    One query returning compact creator cards (profile joined to user,
+    rating read from the user's denormalized totals) instead of listing
+    users and fetching every profile separately. Sorted by followers (default)
+    or rating, highest first, and keyset paginated via next_cursor.
+    Banned creators are hidden; staff can add them back with ?banned=true.
+    """
+    params = request.query_params
+    sort = params.get("sort", "followers")
+    if sort not in CREATOR_SORTS:
+        return Response({"error": f"sort must be one of {', '.join(CREATOR_SORTS)}"}, status=400)
+    limit = parse_limit(params.get("limit"), default=20, maximum=100)
+
+    creators = CreatorProfile.objects.filter(user__role="creator")
+    if not (params.get("banned") == "true" and request.user.is_staff):
+        creators = creators.filter(banned=False)
+    creators = (
+        creators.select_related("user")
+        .only(
+            "user__username", "full_name", "username_handle", "primary_platform",
+            "followers_count", "profile_image", "approved",
+        )
+        .annotate(
+            rating=Case(
+                When(user__rating_count=0, then=Value(0.0)),
+                default=Cast("user__rating_sum", FloatField()) / Cast("user__rating_count", FloatField()),
+                output_field=FloatField(),
+            ),
+            review_count=F("user__rating_count"),
+            bio_excerpt=Substr("bio", 1, BIO_EXCERPT_LENGTH),
+        )
+    )
+
+    try:
+        if params.get("platform"):
+            # UPPER(primary_platform) is the expression creator_platform_followers_idx is built on
+            creators = creators.alias(platform_key=Upper("primary_platform")).filter(
+                platform_key=params["platform"].upper()
+            )
+        if params.get("followers_min"):
+            creators = creators.filter(followers_count__gte=int(params["followers_min"]))
+        if params.get("followers_max"):
+            creators = creators.filter(followers_count__lte=int(params["followers_max"]))
+        if params.get("approved") in ("true", "false"):
+            creators = creators.filter(approved=params["approved"] == "true")
+        if params.get("min_rating"):
+            creators = creators.filter(rating__gte=float(params["min_rating"]))
+    except ValueError:
+        return Response({"error": "Invalid filter value"}, status=400)
+
+    field = CREATOR_SORTS[sort]
+    cursor = params.get("cursor")
+    if cursor:
+        try:
+            value, last_id = decode_keyset(cursor, 2)
+            value = float(value) if sort == "rating" else int(value)
+            creators = creators.filter(
+                Q(**{f"{field}__lt": value}) | Q(**{field: value, "id__lt": int(last_id)})
+            )
+        except (TypeError, ValueError):
+            return Response({"error": "Invalid cursor"}, status=400)
+
+    rows = list(creators.order_by(f"-{field}", "-id")[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_keyset(getattr(rows[-1], field), rows[-1].id)
+
+    return Response({
+        "results": CreatorCardSerializer(rows, many=True).data,
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+    })
+
+
+def brand_profiles():
+    """
+    BrandProfile joined to its user, with project_total and
+    open_project_total (deadline not passed, nobody hired yet) computed
+    as correlated COUNT subqueries in the same statement.
+    """
+    projects = Project.objects.filter(brand=OuterRef("user_id")).order_by().values("brand")
+    open_projects = projects.filter(deadline__gte=timezone.localdate()).exclude(
+        applications__status="hired"
+    )
+    return BrandProfile.objects.select_related("user").annotate(
+        project_total=Coalesce(Subquery(projects.annotate(total=Count("id")).values("total")), 0),
+        open_project_total=Coalesce(Subquery(open_projects.annotate(total=Count("id")).values("total")), 0),
+    )
+
+
 class BrandListView(generics.ListAPIView):
-    serializer_class = UserSerializer
+    """
+    Paginated brand directory: one query per page for profiles, users and
+    project counts. Banned brands are hidden; ?approved=true|false filters
+    on moderation state.
+    """
+    serializer_class = BrandCardSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = BoundedPageNumberPagination
 
     def get_queryset(self):
-        return User.objects.filter(role='brand')
+        brands = brand_profiles().filter(user__role='brand', banned=False).annotate(
+            description_excerpt=Substr("description", 1, BIO_EXCERPT_LENGTH),
+        ).defer("description")
+        approved = self.request.query_params.get("approved")
+        if approved in ("true", "false"):
+            brands = brands.filter(approved=approved == "true")
+        return brands.order_by("-id")
 
 
 # ---------------------------
@@ -361,7 +670,7 @@ class BrandDetailView(generics.RetrieveAPIView):
     def get_object(self):
         user_id = self.kwargs['pk']
         try:
-            return BrandProfile.objects.get(user_id=user_id)
+            return brand_profiles().get(user_id=user_id)
         except BrandProfile.DoesNotExist:
             raise NotFound("Brand profile not found")
 
@@ -384,11 +693,10 @@ class CreatorDetailView(generics.RetrieveAPIView):
 
 
 
-class BrandProjectsView(generics.ListAPIView):
-    serializer_class = ProjectSerializer
+class BrandProjectsView(ProjectListMixin, generics.ListAPIView):
     permission_classes = [permissions.AllowAny]
 
-    def get_queryset(self):
+    def get_project_queryset(self):
         brand_user_id = self.kwargs['pk']
         return Project.objects.filter(brand_id=brand_user_id)
 
@@ -425,9 +733,9 @@ def onboarding_status(request):
     user = request.user
     role = user.role  # assuming User model has role field: "creator" or "brand"
     if role == "creator":
-        completed = CreatorProfile.objects.filter(user=user).exists()
+        completed = hasattr(user, "creatorprofile")
     elif role == "brand":
-        completed = BrandProfile.objects.filter(user=user).exists()
+        completed = hasattr(user, "brandprofile")
     else:
         completed = False
 
@@ -593,7 +901,7 @@ def invite_creator(request):
     creator = get_object_or_404(User, id=creator_id)
 
     # Optional: create an 'invited' application or just notify + chat message
-    ChatMessage.objects.create(sender=request.user, receiver=creator, message=message or f"{request.user.username} invited you to collaborate on '{project.title}'")
+    send_message(request.user, creator, message or f"{request.user.username} invited you to collaborate on '{project.title}'")
     Notification.objects.create(
     recipient=creator,
     message=f"{request.user.username} invited you to collaborate on '{project.title}'",
@@ -660,9 +968,9 @@ def admin_respond_dispute(request, dispute_id):
     # Create admin chat message to both parties so both see it in chat
     if message:
         # admin -> brand
-        ChatMessage.objects.create(sender=request.user, receiver=dispute.collaboration.brand, message=f"[Admin] {message}")
+        send_message(request.user, dispute.collaboration.brand, f"[Admin] {message}")
         # admin -> creator
-        ChatMessage.objects.create(sender=request.user, receiver=dispute.collaboration.creator, message=f"[Admin] {message}")
+        send_message(request.user, dispute.collaboration.creator, f"[Admin] {message}")
 
         Notification.objects.create(recipient=dispute.collaboration.brand, message=f"Admin responded to dispute #{dispute.id}", data={"dispute_id": dispute.id})
         Notification.objects.create(recipient=dispute.collaboration.creator, message=f"Admin responded to dispute #{dispute.id}", data={"dispute_id": dispute.id})
@@ -711,12 +1019,21 @@ def ignore_invite(request):
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def mark_notifications_read(request):
-    Notification.objects.filter(
-        recipient=request.user,
-        is_read=False
-    ).update(is_read=True)
+    """
+    Marks every unread notification read, or only those with id <= up_to
+    when given, so a client never clears ones that arrived after its list
+    was fetched.
+    """
+    up_to = request.data.get("up_to")
+    filters = {}
+    if up_to is not None:
+        try:
+            filters["id__lte"] = int(up_to)
+        except (TypeError, ValueError):
+            return Response({"error": "up_to must be a notification id"}, status=400)
 
-    return Response({"success": True})
+    marked = mark_read(request.user.id, **filters)
+    return Response({"success": True, "marked": marked})
 
 
 
@@ -789,14 +1106,7 @@ def creator_stats(request):
     if user.role != "creator":
         return Response({"error": "Not a creator"}, status=403)
 
-    apps = Application.objects.filter(creator=user)
-
-    return Response({
-        "applied": apps.count(),
-        "pending": apps.filter(status="pending").count(),
-        "hired": apps.filter(status="hired").count(),
-        "rejected": apps.filter(status="rejected").count(),
-    })
+    return Response(creator_stats_for(user.id))
 
 
 
@@ -804,8 +1114,15 @@ class CreatorShowcaseUpdateView(APIView):
     permission_classes = [IsAuthenticated]
 
     def patch(self, request):
-        profile = request.user.creatorprofile
+        try:
+            profile = CreatorProfile.objects.get(user=request.user)
+        except CreatorProfile.DoesNotExist:
+            return Response(
+                {"error": "Creator profile not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
 
+        updated_fields = []
         for i in [1, 2, 3, 4, 5, 6]:  # showcase_image_1 to showcase_image_6
             image = request.FILES.get(f"image_{i}")
             if image:
@@ -814,22 +1131,46 @@ class CreatorShowcaseUpdateView(APIView):
                     folder="creator_showcase"
                 )
                 setattr(profile, f"showcase_image_{i}", result["secure_url"])
+                updated_fields.append(f"showcase_image_{i}")
 
-        profile.save()
+        if updated_fields:
+            profile.save(update_fields=updated_fields)
         return Response(CreatorProfileSerializer(profile).data)
 
 
 class CreatorProjectView(APIView):
+    """
+    Projects with the requesting creator's application status and
+    collaboration id, annotated as correlated subqueries so a page costs
+    two queries however many projects it holds.
+    ?interacted=true limits the list to projects the creator applied to
+    or collaborates on.
+    """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        projects = Project.objects.all()
+        user = request.user
+        applications = Application.objects.filter(project=OuterRef("pk"), creator=user)
+        collaborations = Collaboration.objects.filter(project=OuterRef("pk"), creator=user)
+
+        projects = Project.objects.only("id", "title", "description", "budget").annotate(
+            application_status=Subquery(applications.order_by("id").values("status")[:1]),
+            collaboration_id=Subquery(collaborations.order_by("id").values("id")[:1]),
+        )
+        if request.query_params.get("interacted") == "true":
+            projects = projects.filter(
+                Q(id__in=Application.objects.filter(creator=user).values("project_id"))
+                | Q(id__in=Collaboration.objects.filter(creator=user).values("project_id"))
+            )
+
+        paginator = BoundedPageNumberPagination()
+        page = paginator.paginate_queryset(projects.order_by("-id"), request, view=self)
         serializer = CreatorProjectViewSerializer(
-            projects,
+            page,
             many=True,
             context={"request": request}
         )
-        return Response(serializer.data)
+        return paginator.get_paginated_response(serializer.data)
 
 
 
@@ -855,14 +1196,14 @@ class BrandShowcaseUpdateView(APIView):
 
     def patch(self, request):
         try:
-            profile = request.user.brandprofile
+            profile = BrandProfile.objects.get(user=request.user)
         except BrandProfile.DoesNotExist:
             return Response(
                 {"error": "Brand profile not found"},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        updated = False
+        updated_fields = []
 
         for i in range(1, 7):
             file = request.FILES.get(f"image_{i}")
@@ -872,15 +1213,15 @@ class BrandShowcaseUpdateView(APIView):
                     folder="brand_showcase"
                 )
                 setattr(profile, f"showcase_image_{i}", upload["secure_url"])
-                updated = True
+                updated_fields.append(f"showcase_image_{i}")
 
-        if not updated:
+        if not updated_fields:
             return Response(
                 {"error": "No images received"},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        profile.save()
+        profile.save(update_fields=updated_fields)
 
         return Response({
             f"showcase_image_{i}": getattr(profile, f"showcase_image_{i}")
@@ -889,35 +1230,37 @@ class BrandShowcaseUpdateView(APIView):
 
 
 
-from django.db.models import Sum
-
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def brand_budget_summary(request):
-    user = request.user
-
-    # All projects by brand
-    projects = Project.objects.filter(brand=user)
+    """
+    Allocated/committed/available for the brand, read from its
+    BrandBudget ledger row instead of aggregating projects and hires.
+    """
+    return Response(budget_summary(request.user.id))
 
-    total_allocated = projects.aggregate(
-        total=Sum("budget")
-    )["total"] or 0
 
-    # Budget committed = hired applications
-    committed = Application.objects.filter(
-        project__brand=user,
-        status="hired"
-    ).aggregate(
-        total=Sum("project__budget")
-    )["total"] or 0
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def brand_budget_projects(request):
+    """
+    GET /api/brand/budget-summary/projects/?page=&page_size=
+    Per-project allocated/committed/available, newest project first.
+    """
+    paginator = BoundedPageNumberPagination()
+    page = paginator.paginate_queryset(project_breakdown(request.user.id), request)
+    return paginator.get_paginated_response(page)
 
-    available = total_allocated - committed
 
-    return Response({
-        "total_allocated": total_allocated,
-        "committed": committed,
-        "available": available,
-    })
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def brand_budget_monthly(request):
+    """
+    GET /api/brand/budget-summary/monthly/?months=
+    Monthly allocated/committed changes with running totals, oldest first.
+    """
+    months = parse_limit(request.query_params.get("months"), default=12, maximum=120)
+    return Response({"results": monthly_series(request.user.id, months)})
 
 
 class BrandProfileImageUpdateView(APIView):
@@ -0,0 +1,17 @@
+class QueryCounter:
+    """
+    Counts SQL statements on every DB connection, including the ones
+    database_sync_to_async opens in its worker thread. Used by the
+    bench_* management commands.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+    def attach(self, connection, **kwargs):
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
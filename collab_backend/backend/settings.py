@@ -76,6 +76,48 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Shared cache for rating summaries, creator stats and unread counters. Writers
+# invalidate it from whichever process handled the write, so every web/ASGI
+# process must use the same store. CACHE_URL=locmem:// switches to the
+# per-process LocMemCache, which is only correct when a single process serves
+# all requests (tests, local runs without Redis).
+CACHE_URL = os.environ.get("CACHE_URL", REDIS_URL)
+if CACHE_URL.startswith("locmem://"):
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+else:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": CACHE_URL}}
+
+# Write-behind chat persistence: broadcast immediately, batch the INSERTs
+CHAT_WRITE_BEHIND = os.environ.get("CHAT_WRITE_BEHIND", "false").lower() == "true"
+CHAT_WRITE_BEHIND_BATCH_SIZE = int(os.environ.get("CHAT_WRITE_BEHIND_BATCH_SIZE", 100))
+CHAT_WRITE_BEHIND_FLUSH_INTERVAL = float(os.environ.get("CHAT_WRITE_BEHIND_FLUSH_INTERVAL", 0.5))
+CHAT_WRITE_BEHIND_MAX_PENDING = int(os.environ.get("CHAT_WRITE_BEHIND_MAX_PENDING", 10000))
+
+# Presence: connection refcounts + heartbeats live in the channel-layer Redis
+PRESENCE_HEARTBEAT_INTERVAL = int(os.environ.get("PRESENCE_HEARTBEAT_INTERVAL", 30))
+PRESENCE_TTL = int(os.environ.get("PRESENCE_TTL", PRESENCE_HEARTBEAT_INTERVAL * 3))
+PRESENCE_FLUSH_INTERVAL = float(os.environ.get("PRESENCE_FLUSH_INTERVAL", 5))
+
+# Resolved-user cache for the WebSocket handshake (JWTAuthMiddleware + peer lookup)
+USER_CACHE_MAX_SIZE = int(os.environ.get("USER_CACHE_MAX_SIZE", 10000))
+USER_CACHE_TTL = int(os.environ.get("USER_CACHE_TTL", 60))
+
+# Typing indicators: publish state changes at most every N ms, auto-stop after T seconds
+TYPING_MIN_INTERVAL_MS = int(os.environ.get("TYPING_MIN_INTERVAL_MS", 500))
+TYPING_TIMEOUT = float(os.environ.get("TYPING_TIMEOUT", 5))
+
+# Read receipts: acks for a conversation inside this window collapse into one write
+READ_ACK_WINDOW_MS = int(os.environ.get("READ_ACK_WINDOW_MS", 300))
+
+# Batch rating summaries (reviews/ratings/): per-user cache lifetime in seconds
+RATING_SUMMARY_CACHE_TTL = int(os.environ.get("RATING_SUMMARY_CACHE_TTL", 30))
+
+# creator_stats dashboard counters; Application writes invalidate, TTL is a safety net
+CREATOR_STATS_CACHE_TTL = int(os.environ.get("CREATOR_STATS_CACHE_TTL", 300))
+
+# notifications/unread-count/ counter; creates and mark-read adjust it, TTL bounds drift
+NOTIFICATION_UNREAD_CACHE_TTL = int(os.environ.get("NOTIFICATION_UNREAD_CACHE_TTL", 300))
+
 
 # ---------------------------------------------------------------------
 # Middleware
@@ -169,6 +211,19 @@ REST_FRAMEWORK = {
 }
 
 # Authentication settings here
+SUPABASE_JWT_SECRET = os.environ.get("SUPABASE_JWT_SECRET")
+
+# Asymmetric (ES256/RS256) tokens: local JWKS file or directory of *.json/*.pem keys, indexed by kid
+SUPABASE_JWKS_PATH = os.environ.get("SUPABASE_JWKS_PATH")
+SUPABASE_JWKS_CHECK_INTERVAL = float(os.environ.get("SUPABASE_JWKS_CHECK_INTERVAL", 5))
+
+# Verified Supabase token payloads, reused until the token's exp (or the TTL)
+AUTH_TOKEN_CACHE_MAX_SIZE = int(os.environ.get("AUTH_TOKEN_CACHE_MAX_SIZE", 10000))
+AUTH_TOKEN_CACHE_TTL = int(os.environ.get("AUTH_TOKEN_CACHE_TTL", 300))
+
+# Authenticated user + creator/brand profile, resolved in one query and cached per email
+IDENTITY_CACHE_MAX_SIZE = int(os.environ.get("IDENTITY_CACHE_MAX_SIZE", 10000))
+IDENTITY_CACHE_TTL = int(os.environ.get("IDENTITY_CACHE_TTL", 60))
 
 
 
@@ -232,3 +287,20 @@ cloudinary.config (
 # ---------------------------------------------------------------------
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# ---------------------------------------------------------------------
+# Logging
+# ---------------------------------------------------------------------
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "accounts": {"handlers": ["console"], "level": os.environ.get("APP_LOG_LEVEL", "INFO")},
+        "chat": {"handlers": ["console"], "level": os.environ.get("APP_LOG_LEVEL", "INFO")},
+    },
+}
@@ -1,8 +1,14 @@
 from django.contrib import admin
-from .models import ChatMessage
+from .models import ChatMessage, Conversation
 
 @admin.register(ChatMessage)
 class ChatMessageAdmin(admin.ModelAdmin):
     list_display = ("id", "sender", "receiver", "message", "created_at", "is_system")
     list_filter = ("sender", "receiver", "is_system")
     search_fields = ("message",)
+
+
+@admin.register(Conversation)
+class ConversationAdmin(admin.ModelAdmin):
+    list_display = ("id", "user_low", "user_high", "last_message_at", "low_unread", "high_unread")
+    raw_id_fields = ("user_low", "user_high", "last_message", "last_sender")
@@ -0,0 +1,136 @@
+import asyncio
+import atexit
+import logging
+import threading
+import time
+
+from channels.db import database_sync_to_async
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+class MessageBuffer:
+    """
+    Per-process write-behind buffer for ChatMessage rows.
+
+    Consumers broadcast first and then add() the unsaved instance here.
+    Pending rows are written with a single bulk_create once `batch_size`
+    rows are queued or `flush_interval` seconds after the first queued row,
+    whichever comes first. flush() is awaited on disconnect and
+    flush_sync() runs at interpreter exit so a graceful shutdown never
+    drops buffered messages.
+
+    A failed flush requeues its batch and retries on a timer that backs off
+    up to MAX_RETRY_INTERVAL. At most `max_pending` rows are held; once
+    full, `full` is true and callers write directly instead of queueing.
+    """
+
+    MAX_RETRY_INTERVAL = 30.0
+
+    def __init__(self, batch_size=100, flush_interval=0.5, max_pending=10000):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending = []
+        self._lock = threading.Lock()
+        self._timer = None
+        self._failed_flushes = 0
+        self.stats = {
+            "flushes": 0,
+            "messages": 0,
+            "failures": 0,
+            "last_batch_size": 0,
+            "max_batch_size": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+            "total_flush_ms": 0.0,
+        }
+
+    def __len__(self):
+        return len(self._pending)
+
+    @property
+    def full(self):
+        return len(self._pending) >= self.max_pending
+
+    async def add(self, message):
+        with self._lock:
+            self._pending.append(message)
+            size = len(self._pending)
+
+        # While flushes are failing only the retry timer writes
+        if size >= self.batch_size and not self._failed_flushes:
+            await self.flush()
+        elif self._timer is None:
+            self._schedule(self.flush_interval)
+
+    async def flush(self):
+        batch = self._drain()
+        if not batch:
+            return
+        if await database_sync_to_async(self._write)(batch):
+            self._failed_flushes = 0
+            return
+
+        self._failed_flushes += 1
+        if self._timer is None:
+            self._schedule(min(self.flush_interval * 2 ** self._failed_flushes, self.MAX_RETRY_INTERVAL))
+
+    def flush_sync(self):
+        batch = self._drain()
+        if batch:
+            self._write(batch)
+
+    def _schedule(self, delay):
+        loop = asyncio.get_running_loop()
+        self._timer = loop.call_later(delay, lambda: loop.create_task(self.flush()))
+
+    def _drain(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        with self._lock:
+            batch, self._pending = self._pending, []
+        return batch
+
+    def _write(self, batch):
+        from .conversations import record_messages
+        from .models import ChatMessage
+
+        started = time.perf_counter()
+        try:
+            with transaction.atomic():
+                ChatMessage.objects.bulk_create(batch, batch_size=self.batch_size)
+                record_messages(batch)
+        except Exception:
+            self.stats["failures"] += 1
+            logger.exception("chat write-behind flush of %d messages failed, requeueing", len(batch))
+            for message in batch:
+                message.pk = None
+                message._state.adding = True
+            with self._lock:
+                self._pending[:0] = batch
+            return False
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.stats["flushes"] += 1
+        self.stats["messages"] += len(batch)
+        self.stats["last_batch_size"] = len(batch)
+        self.stats["max_batch_size"] = max(self.stats["max_batch_size"], len(batch))
+        self.stats["last_flush_ms"] = elapsed_ms
+        self.stats["max_flush_ms"] = max(self.stats["max_flush_ms"], elapsed_ms)
+        self.stats["total_flush_ms"] += elapsed_ms
+        logger.info("chat write-behind flushed %d messages in %.1fms", len(batch), elapsed_ms)
+        return True
+
+
+message_buffer = MessageBuffer(
+    batch_size=getattr(settings, "CHAT_WRITE_BEHIND_BATCH_SIZE", 100),
+    flush_interval=getattr(settings, "CHAT_WRITE_BEHIND_FLUSH_INTERVAL", 0.5),
+    max_pending=getattr(settings, "CHAT_WRITE_BEHIND_MAX_PENDING", 10000),
+)
+
+atexit.register(message_buffer.flush_sync)
@@ -0,0 +1,128 @@
+import json
+
+import msgpack
+
+MSGPACK_SUBPROTOCOL = "collab.msgpack.v1"
+
+# Event type <-> small int for the binary protocol
+TYPE_CODES = {
+    "new_message": 1,
+    "chat_message": 1,
+    "typing_start": 2,
+    "typing_stop": 3,
+    "user_online": 4,
+    "user_offline": 5,
+    "presence_snapshot": 6,
+    "error": 7,
+    "watch_presence": 8,
+    "read_receipt": 9,
+    "read": 10,
+}
+TYPE_NAMES = {
+    1: "new_message",
+    2: "typing_start",
+    3: "typing_stop",
+    4: "user_online",
+    5: "user_offline",
+    6: "presence_snapshot",
+    7: "error",
+    8: "watch_presence",
+    9: "read_receipt",
+    10: "read",
+}
+
+SHORT_KEYS = {
+    "type": "t",
+    "message": "m",
+    "peer_id": "p",
+    "user_id": "i",
+    "user_ids": "l",
+    "users": "l",
+    "status": "st",
+    "self": "o",
+    "error": "e",
+    "message_id": "n",
+    "last_read_id": "r",
+}
+LONG_KEYS = {
+    "t": "type",
+    "m": "message",
+    "p": "peer_id",
+    "i": "user_id",
+    "l": "user_ids",
+    "st": "status",
+    "o": "self",
+    "e": "error",
+    "n": "message_id",
+    "r": "last_read_id",
+}
+
+# Always implied by the socket's peer (ChatConsumer) or by peer_id + self
+# (InboxConsumer), so never put on the wire in binary frames.
+REDUNDANT_KEYS = {"sender_id", "receiver_id", "sender_username"}
+
+
+class JsonCodec:
+    """
+    Default text protocol: payloads go out exactly as built.
+    """
+
+    subprotocol = None
+
+    def encode(self, payload):
+        return {"text_data": json.dumps(payload)}
+
+    def decode(self, text_data=None, bytes_data=None):
+        data = json.loads(text_data if text_data is not None else bytes_data)
+        if not isinstance(data, dict):
+            raise ValueError("Frame must be an object")
+        return data
+
+
+class MsgpackCodec:
+    """
+    Binary protocol negotiated via the `collab.msgpack.v1` subprotocol.
+
+    Keys are shortened (SHORT_KEYS), event types become ints (TYPE_CODES)
+    and REDUNDANT_KEYS are dropped. Text frames are still accepted as JSON.
+    """
+
+    subprotocol = MSGPACK_SUBPROTOCOL
+
+    def encode(self, payload):
+        compact = {}
+        for key, value in payload.items():
+            if key in REDUNDANT_KEYS:
+                continue
+            if key == "type":
+                value = TYPE_CODES.get(value, value)
+            elif key == "users":
+                value = [self._shorten(item) for item in value]
+            compact[SHORT_KEYS.get(key, key)] = value
+        return {"bytes_data": msgpack.packb(compact, use_bin_type=True)}
+
+    def _shorten(self, item):
+        return {SHORT_KEYS.get(key, key): value for key, value in item.items()}
+
+    def decode(self, text_data=None, bytes_data=None):
+        if bytes_data is None:
+            return JsonCodec().decode(text_data)
+
+        compact = msgpack.unpackb(bytes_data, raw=False)
+        if not isinstance(compact, dict):
+            raise ValueError("Frame must be a map")
+
+        data = {LONG_KEYS.get(key, key): value for key, value in compact.items()}
+        if isinstance(data.get("type"), int):
+            data["type"] = TYPE_NAMES.get(data["type"])
+        return data
+
+
+def negotiate(subprotocols):
+    """
+    Pick the codec for a handshake's requested subprotocols (JSON unless
+    the client asks for msgpack).
+    """
+    if MSGPACK_SUBPROTOCOL in (subprotocols or []):
+        return MsgpackCodec()
+    return JsonCodec()
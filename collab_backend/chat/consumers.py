@@ -1,9 +1,54 @@
-import json
+import asyncio
+import logging
+
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
+from django.conf import settings
+
+from .buffer import message_buffer
+from .codec import negotiate
+from .conversations import send_message
+from .presence import (
+    HEARTBEAT_INTERVAL,
+    broadcast_status,
+    presence_group,
+    presence_store,
+    presence_writer,
+    sweep_and_broadcast,
+)
+from .receipts import ReadAckBatcher
+from .typing_throttle import TypingThrottle
+from .user_cache import user_cache
+
+logger = logging.getLogger(__name__)
+
+# Max users an inbox socket may watch presence for in one request
+MAX_WATCHED_USERS = 200
+
+
+def user_group(user_id):
+    """
+    Personal channel-layer group: every inbox socket of user_id, whatever
+    the conversation.
+    """
+    return f"user_{user_id}"
+
+
+def pair_group(user_id, peer_id):
+    """
+    Per-conversation group for the legacy ws/chat/<id>/ sockets, so they
+    only wake up for their own conversation.
+    """
+    return f"chat_{min(user_id, peer_id)}_{max(user_id, peer_id)}"
 
 
 class ChatConsumer(AsyncWebsocketConsumer):
+    """
+    One socket per conversation: ws/chat/<user_id>/.
+
+    Joins the conversation's pair group, so it only receives events for
+    the conversation with `other_user_id`.
+    """
 
     async def connect(self):
         from django.contrib.auth import get_user_model
@@ -24,140 +69,334 @@ class ChatConsumer(AsyncWebsocketConsumer):
 
         # Verify other user exists
         try:
-            self.other_user = await database_sync_to_async(User.objects.get)(
-                id=self.other_user_id
-            )
+            self.other_user = await user_cache.aget(self.other_user_id)
         except User.DoesNotExist:
             await self.close()
             return
 
-        # Mark current user online
-        await database_sync_to_async(self.update_user_status)(True)
+        self.watched_users = {self.other_user_id}
+        await self.join()
 
-        # Create room
-        self.room_name = f"chat_{min(self.user.id, self.other_user_id)}_{max(self.user.id, self.other_user_id)}"
-        self.room_group_name = self.room_name
+        # Tell this socket where the peer stands right now
+        peer_online = await presence_store.is_online(self.other_user_id)
+        await self.user_status({
+            "user_id": self.other_user_id,
+            "status": "online" if peer_online else "offline",
+        })
 
-        await self.channel_layer.group_add(self.room_group_name, self.channel_name)
-        await self.accept()
+    def event_group(self):
+        return pair_group(self.user.id, self.other_user_id)
 
-        print(f"✅ CONNECTED → {self.user.username}")
+    async def join(self):
+        await self.channel_layer.group_add(self.event_group(), self.channel_name)
+        for user_id in self.watched_users:
+            await self.channel_layer.group_add(presence_group(user_id), self.channel_name)
+        self.codec = negotiate(self.scope.get("subprotocols"))
+        await self.accept(self.codec.subprotocol)
 
-        await self.channel_layer.group_send(
-            self.room_group_name,
-            {
-                "type": "user_status",
-                "user_id": self.user.id,
-                "status": "online",
-            },
-        )
+        logger.info("WebSocket connected: %s", self.user.username)
+
+        # Mark current user online (only the first tab announces it)
+        if await presence_store.connect(self.user.id, self.channel_name):
+            presence_writer.mark(self.user.id, True)
+            await broadcast_status(self.channel_layer, self.user.id, "online")
+
+        self.typing = TypingThrottle(self.send_typing)
+        self.receipts = ReadAckBatcher(self.user.id, self.send_read_receipt)
+        self.heartbeat_task = asyncio.create_task(self.heartbeat())
 
     # ==========================
-    # USER STATUS (SAFE)
+    # USER STATUS (PRESENCE)
     # ==========================
-    def update_user_status(self, is_online):
-        from django.utils import timezone
+    async def heartbeat(self):
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            await presence_store.heartbeat(self.user.id, self.channel_name)
+            await sweep_and_broadcast(self.channel_layer)
 
+    async def disconnect(self, close_code):
         if not self.user or not self.user.is_authenticated:
             return
 
-        self.user.is_online = is_online
-        if is_online:
-            self.user.last_seen = timezone.now()
+        if not hasattr(self, "heartbeat_task"):
+            return
+
+        self.heartbeat_task.cancel()
 
-        self.user.save()
+        # Never leave the peer staring at a stuck "typing..." indicator
+        await self.typing.stop_all()
+        await self.receipts.flush_all()
 
-    async def disconnect(self, close_code):
-        if not self.user or not self.user.is_authenticated:
-            return
+        # Only the last tab to close takes the user offline
+        if await presence_store.disconnect(self.user.id, self.channel_name):
+            presence_writer.mark(self.user.id, False)
+            await broadcast_status(self.channel_layer, self.user.id, "offline")
 
-        await database_sync_to_async(self.update_user_status)(False)
+        # Make sure anything this socket queued is on disk before it goes away
+        if settings.CHAT_WRITE_BEHIND:
+            await message_buffer.flush()
 
-        if hasattr(self, "room_group_name"):
-            await self.channel_layer.group_send(
-                self.room_group_name,
-                {
-                    "type": "user_status",
-                    "user_id": self.user.id,
-                    "status": "offline",
-                },
-            )
-            await self.channel_layer.group_discard(
-                self.room_group_name, self.channel_name
-            )
+        await self.channel_layer.group_discard(self.event_group(), self.channel_name)
+        for user_id in self.watched_users:
+            await self.channel_layer.group_discard(presence_group(user_id), self.channel_name)
 
-        print(f"❌ DISCONNECTED → {self.user.username}")
+        logger.info("WebSocket disconnected: %s", self.user.username)
 
     # ==========================
     # RECEIVE MESSAGES
     # ==========================
-    async def receive(self, text_data):
-        data = json.loads(text_data)
+    async def receive(self, text_data=None, bytes_data=None):
+        try:
+            data = self.codec.decode(text_data, bytes_data)
+        except ValueError:
+            return
         msg_type = data.get("type")
-        message = data.get("message", "").strip()
+        message = (data.get("message") or "").strip()
 
-        if msg_type == "typing_start":
-            await self.channel_layer.group_send(
-                self.room_group_name,
-                {
-                    "type": "typing_start",
-                    "sender_username": self.user.username,
-                },
-            )
+        if msg_type in ("typing_start", "typing_stop"):
+            await self.typing.update(self.other_user_id, msg_type == "typing_start")
             return
 
-        if msg_type == "typing_stop":
-            await self.channel_layer.group_send(
-                self.room_group_name,
-                {
-                    "type": "typing_stop",
-                    "sender_username": self.user.username,
-                },
-            )
+        if msg_type == "read":
+            self.ack_read(self.other_user_id, data)
             return
 
         if not message:
             return
 
+        await self.send_chat_message(self.other_user, message)
+
+    async def send_event(self, payload):
+        await self.send(**self.codec.encode(payload))
+
+    async def deliver(self, peer_id, event):
+        """
+        Fan an event out to both participants' inbox sockets and to the
+        conversation's legacy sockets.
+        """
+        await self.channel_layer.group_send(user_group(peer_id), event)
+        if peer_id != self.user.id:
+            await self.channel_layer.group_send(user_group(self.user.id), event)
+        await self.channel_layer.group_send(pair_group(self.user.id, peer_id), event)
+
+    async def send_typing(self, peer_id, msg_type):
+        event = {
+            "type": msg_type,
+            "sender_id": self.user.id,
+            "receiver_id": peer_id,
+            "sender_username": self.user.username,
+        }
+        await self.channel_layer.group_send(user_group(peer_id), event)
+        await self.channel_layer.group_send(pair_group(self.user.id, peer_id), event)
+
+    def ack_read(self, peer_id, data):
+        try:
+            message_id = int(data.get("message_id"))
+        except (TypeError, ValueError):
+            return
+        if message_id > 0:
+            self.receipts.ack(peer_id, message_id)
+
+    async def send_read_receipt(self, peer_id, message_id):
+        # Inbox sockets only: legacy ws/chat/ clients have no receipt handling
+        event = {
+            "type": "read_receipt",
+            "sender_id": self.user.id,
+            "receiver_id": peer_id,
+            "last_read_id": message_id,
+        }
+        await self.channel_layer.group_send(user_group(peer_id), event)
+        if peer_id != self.user.id:
+            await self.channel_layer.group_send(user_group(self.user.id), event)
+
+    async def send_chat_message(self, peer, message):
         from .models import ChatMessage
 
-        await database_sync_to_async(ChatMessage.objects.create)(
-            sender=self.user,
-            receiver=self.other_user,
-            message=message,
-        )
+        # A full buffer means flushes are failing: write through instead of queueing more
+        write_behind = settings.CHAT_WRITE_BEHIND and not message_buffer.full
+        if not write_behind:
+            await database_sync_to_async(send_message)(self.user, peer, message)
 
-        await self.channel_layer.group_send(
-            self.room_group_name,
+        await self.deliver(
+            peer.id,
             {
                 "type": "chat_message",
                 "sender_id": self.user.id,
+                "receiver_id": peer.id,
                 "sender_username": self.user.username,
                 "message": message,
+                "origin": self.channel_name,
             },
         )
 
+        # Write-behind: broadcast first, persist with the next batch
+        if write_behind:
+            await message_buffer.add(ChatMessage(
+                sender=self.user,
+                receiver=peer,
+                message=message,
+            ))
+
     # ==========================
     # WS EVENT HANDLERS
     # ==========================
+    # The pair group also holds this user's own sockets; only forward the peer's events
     async def chat_message(self, event):
-        if self.user.id != event["sender_id"]:
-            await self.send(text_data=json.dumps({
-                "type": "new_message",
-                **event
-            }))
+        if event["sender_id"] == self.other_user_id:
+            # JSON clients have always seen the layer event's own type here
+            await self.send_event({
+                "type": "chat_message",
+                "sender_id": event["sender_id"],
+                "receiver_id": event["receiver_id"],
+                "sender_username": event["sender_username"],
+                "message": event["message"],
+            })
 
     async def typing_start(self, event):
-        if self.user.username != event["sender_username"]:
-            await self.send(text_data=json.dumps(event))
+        if event["sender_id"] == self.other_user_id:
+            await self.send_event(event)
 
     async def typing_stop(self, event):
-        if self.user.username != event["sender_username"]:
-            await self.send(text_data=json.dumps(event))
+        if event["sender_id"] == self.other_user_id:
+            await self.send_event(event)
 
     async def user_status(self, event):
         status_type = "user_online" if event["status"] == "online" else "user_offline"
-        await self.send(text_data=json.dumps({
+        await self.send_event({
             "type": status_type,
             "user_id": event["user_id"],
-        }))
+        })
+
+
+class InboxConsumer(ChatConsumer):
+    """
+    One socket per user for every conversation: ws/inbox/.
+
+    Client frames carry the conversation peer:
+      {"type": "message", "peer_id": 7, "message": "hi"}
+      {"type": "typing_start" | "typing_stop", "peer_id": 7}
+      {"type": "read", "peer_id": 7, "message_id": 1234}
+      {"type": "watch_presence", "user_ids": [7, 9]}
+
+    Outbound events carry `peer_id` so the client can route them. The
+    user's other sockets also receive their own messages (`self: true`).
+    """
+
+    async def connect(self):
+        self.user = self.scope.get("user")
+
+        if not self.user or not self.user.is_authenticated:
+            await self.close()
+            return
+
+        self.watched_users = set()
+        await self.join()
+
+    def event_group(self):
+        return user_group(self.user.id)
+
+    async def receive(self, text_data=None, bytes_data=None):
+        from django.contrib.auth import get_user_model
+        User = get_user_model()
+
+        try:
+            data = self.codec.decode(text_data, bytes_data)
+        except ValueError:
+            return
+        msg_type = data.get("type")
+
+        if msg_type == "watch_presence":
+            user_ids = data.get("user_ids") or []
+            if not isinstance(user_ids, list):
+                await self.send_error("user_ids must be a list")
+                return
+            await self.watch_presence(user_ids)
+            return
+
+        try:
+            peer_id = int(data.get("peer_id"))
+        except (TypeError, ValueError):
+            await self.send_error("peer_id required")
+            return
+
+        if msg_type in ("typing_start", "typing_stop"):
+            await self.typing.update(peer_id, msg_type == "typing_start")
+            return
+
+        if msg_type == "read":
+            self.ack_read(peer_id, data)
+            return
+
+        message = (data.get("message") or "").strip()
+        if not message:
+            return
+
+        try:
+            peer = await user_cache.aget(peer_id)
+        except User.DoesNotExist:
+            await self.send_error("Unknown peer", peer_id=peer_id)
+            return
+
+        await self.send_chat_message(peer, message)
+
+    async def watch_presence(self, user_ids):
+        statuses = []
+        for user_id in user_ids[:MAX_WATCHED_USERS]:
+            try:
+                user_id = int(user_id)
+            except (TypeError, ValueError):
+                continue
+            if user_id not in self.watched_users:
+                if len(self.watched_users) >= MAX_WATCHED_USERS:
+                    break
+                self.watched_users.add(user_id)
+                await self.channel_layer.group_add(presence_group(user_id), self.channel_name)
+            online = await presence_store.is_online(user_id)
+            statuses.append({"user_id": user_id, "status": "online" if online else "offline"})
+
+        await self.send_event({
+            "type": "presence_snapshot",
+            "users": statuses,
+        })
+
+    async def send_error(self, error, **extra):
+        await self.send_event({"type": "error", "error": error, **extra})
+
+    # ==========================
+    # WS EVENT HANDLERS
+    # ==========================
+    async def chat_message(self, event):
+        if event.get("origin") == self.channel_name:
+            return
+        is_self = event["sender_id"] == self.user.id
+        await self.send_event({
+            "type": "new_message",
+            "peer_id": event["receiver_id"] if is_self else event["sender_id"],
+            "self": is_self,
+            "sender_id": event["sender_id"],
+            "sender_username": event["sender_username"],
+            "message": event["message"],
+        })
+
+    async def typing_start(self, event):
+        await self.send_event({
+            "type": "typing_start",
+            "peer_id": event["sender_id"],
+            "sender_username": event["sender_username"],
+        })
+
+    async def typing_stop(self, event):
+        await self.send_event({
+            "type": "typing_stop",
+            "peer_id": event["sender_id"],
+            "sender_username": event["sender_username"],
+        })
+
+    async def read_receipt(self, event):
+        is_self = event["sender_id"] == self.user.id
+        await self.send_event({
+            "type": "read_receipt",
+            "peer_id": event["receiver_id"] if is_self else event["sender_id"],
+            "user_id": event["sender_id"],
+            "last_read_id": event["last_read_id"],
+        })
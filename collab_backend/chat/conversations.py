@@ -0,0 +1,110 @@
+from django.db import transaction
+from django.db.models import Count, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import ChatMessage, Conversation
+
+PREVIEW_LENGTH = 140
+
+
+def conversation_key(user_a_id, user_b_id):
+    return min(user_a_id, user_b_id), max(user_a_id, user_b_id)
+
+
+def message_preview(message):
+    if message.is_deleted:
+        return ""
+    return message.message[:PREVIEW_LENGTH]
+
+
+def record_messages(messages):
+    """
+    Fold freshly inserted messages into their Conversation rows.
+
+    Must run inside the transaction that inserted them so the inbox never
+    disagrees with ChatMessage. Rows are locked with select_for_update, so
+    concurrent writers to the same pair serialize instead of losing counts.
+    System messages (no sender) are not part of a conversation.
+    """
+    by_pair = {}
+    for msg in messages:
+        if msg.sender_id is None or msg.is_system:
+            continue
+        by_pair.setdefault(conversation_key(msg.sender_id, msg.receiver_id), []).append(msg)
+
+    for (low_id, high_id), pair_messages in sorted(by_pair.items()):
+        conversation, _ = Conversation.objects.select_for_update().get_or_create(
+            user_low_id=low_id, user_high_id=high_id
+        )
+
+        for msg in pair_messages:
+            if msg.sender_id == msg.receiver_id:
+                continue
+            if msg.sender_id == low_id:
+                conversation.high_unread += 1
+            else:
+                conversation.low_unread += 1
+
+        last = max(pair_messages, key=lambda m: (m.created_at, m.pk or 0))
+        if conversation.last_message_at is None or last.created_at >= conversation.last_message_at:
+            conversation.last_message_id = last.pk
+            conversation.last_sender_id = last.sender_id
+            conversation.last_message_preview = message_preview(last)
+            conversation.last_message_at = last.created_at
+
+        conversation.save(update_fields=[
+            "last_message", "last_sender", "last_message_preview", "last_message_at",
+            "low_unread", "high_unread",
+        ])
+
+
+def send_message(sender, receiver, message, **extra):
+    """
+    ChatMessage.objects.create + inbox update in one transaction.
+    """
+    with transaction.atomic():
+        chat_message = ChatMessage.objects.create(
+            sender=sender, receiver=receiver, message=message, **extra
+        )
+        record_messages([chat_message])
+    return chat_message
+
+
+def refresh_preview(message):
+    """
+    Keep the inbox preview in step after an edit or delete.
+    """
+    Conversation.objects.filter(last_message=message).update(
+        last_message_preview=message_preview(message)
+    )
+
+
+def mark_read(reader_id, peer_id, message_id):
+    """
+    Move reader's read cursor in the conversation with peer to message_id
+    and recompute their unread counter in a single UPDATE. The cursor only
+    moves forward and never past the conversation's last message.
+    Returns the new cursor, or None if it did not move.
+    """
+    low_id, high_id = conversation_key(reader_id, peer_id)
+    side = "low" if reader_id == low_id else "high"
+    conversation = Conversation.objects.filter(user_low_id=low_id, user_high_id=high_id)
+
+    # Clamp once so the stored cursor and the unread recount use the same id
+    last_message_id = conversation.values_list("last_message_id", flat=True).first()
+    if last_message_id is None:
+        return None
+    cursor = min(message_id, last_message_id)
+
+    still_unread = (
+        ChatMessage.objects.filter(sender_id=peer_id, receiver_id=reader_id, id__gt=cursor)
+        .order_by()
+        .values("receiver_id")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    updated = conversation.filter(**{f"{side}_last_read_id__lt": cursor}).update(**{
+        f"{side}_last_read_id": cursor,
+        f"{side}_unread": Coalesce(Subquery(still_unread), 0),
+    })
+    return cursor if updated else None
@@ -0,0 +1,219 @@
+import asyncio
+import json
+import statistics
+import time
+
+from channels.layers import channel_layers
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from backend.bench import QueryCounter
+from chat.presence import presence_store
+
+User = get_user_model()
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return round(ordered[index], 3)
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive simulated chat traffic through ChatConsumer/InboxConsumer in-process "
+        "and report latency percentiles, throughput and DB queries per message as JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=50, help="Simulated users (paired into conversations)")
+        parser.add_argument("--messages", type=int, default=20, help="Messages sent by each user")
+        parser.add_argument("--typing", type=int, default=5, help="typing_start frames before each message")
+        parser.add_argument("--interval", type=float, default=0.0, help="Seconds between a user's messages")
+        parser.add_argument("--layer", choices=["memory", "redis"], default="memory")
+        parser.add_argument("--redis-url", default=getattr(settings, "REDIS_URL", "redis://127.0.0.1:6379"))
+        parser.add_argument("--inbox", action="store_true", help="Use ws/inbox/ instead of ws/chat/<id>/")
+        parser.add_argument("--write-behind", action="store_true", help="Enable CHAT_WRITE_BEHIND")
+        parser.add_argument("--timeout", type=float, default=30.0)
+        parser.add_argument("--output", help="Also write the JSON report to this file")
+
+    def handle(self, *args, **options):
+        users = max(2, options["users"] - options["users"] % 2)
+
+        if options["layer"] == "redis":
+            layer = {
+                "BACKEND": "channels_redis.core.RedisChannelLayer",
+                "CONFIG": {"hosts": [options["redis_url"]]},
+            }
+        else:
+            layer = {"BACKEND": "channels.layers.InMemoryChannelLayer"}
+        settings.CHANNEL_LAYERS = {"default": layer}
+        channel_layers.backends = {}
+        presence_store.reset()
+        settings.CHAT_WRITE_BEHIND = options["write_behind"]
+
+        # Never touch the real database: run against a throwaway test DB
+        setup_test_environment()
+        connection = connections["default"]
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            report = asyncio.run(self.run(users, options))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report["config"] = {
+            "users": users,
+            "messages_per_user": options["messages"],
+            "typing_frames_per_message": options["typing"],
+            "interval": options["interval"],
+            "layer": options["layer"],
+            "inbox": options["inbox"],
+            "write_behind": options["write_behind"],
+        }
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                fh.write(output)
+        self.stdout.write(output)
+
+    async def run(self, users, options):
+        from channels.db import database_sync_to_async
+
+        from chat.buffer import message_buffer
+        from chat.routing import websocket_urlpatterns
+
+        application = URLRouter(websocket_urlpatterns)
+        counter = QueryCounter()
+        connection_created.connect(counter.attach)
+
+        def create_users():
+            User.objects.bulk_create([
+                User(username=f"bench_{i}", email=f"bench_{i}@bench.local")
+                for i in range(users)
+            ])
+            return list(User.objects.filter(username__startswith="bench_").order_by("id"))
+
+        people = await database_sync_to_async(create_users)()
+        peers = {}
+        for a, b in zip(people[::2], people[1::2]):
+            peers[a.id], peers[b.id] = b, a
+
+        # Handshakes
+        sockets = {}
+        connect_ms = []
+
+        async def open_socket(user):
+            path = "/ws/inbox/" if options["inbox"] else f"/ws/chat/{peers[user.id].id}/"
+            communicator = WebsocketCommunicator(application, path)
+            communicator.scope["user"] = user
+            started = time.perf_counter()
+            connected, _ = await communicator.connect(timeout=options["timeout"])
+            connect_ms.append((time.perf_counter() - started) * 1000)
+            if not connected:
+                raise RuntimeError(f"{user.username} failed to connect")
+            sockets[user.id] = communicator
+
+        await asyncio.gather(*(open_socket(user) for user in people))
+
+        # Traffic
+        sent_at = {}
+        latencies = []
+        typing_frames = 0
+        expected = len(people) * options["messages"]
+        all_received = asyncio.Event()
+
+        async def reader(user):
+            nonlocal typing_frames
+            communicator = sockets[user.id]
+            while True:
+                # No timeout: a communicator timeout would cancel the consumer
+                frame = json.loads(await communicator.receive_from(timeout=None))
+                if frame.get("type") in ("typing_start", "typing_stop"):
+                    typing_frames += 1
+                elif "message" in frame:
+                    seq = frame["message"].split(":", 1)[0]
+                    if seq in sent_at:
+                        latencies.append((time.perf_counter() - sent_at.pop(seq)) * 1000)
+                        if len(latencies) == expected:
+                            all_received.set()
+
+        async def writer(user):
+            communicator = sockets[user.id]
+            peer_id = peers[user.id].id
+            for n in range(options["messages"]):
+                for _ in range(options["typing"]):
+                    await communicator.send_json_to({"type": "typing_start", "peer_id": peer_id})
+                seq = f"{user.id}-{n}"
+                sent_at[seq] = time.perf_counter()
+                await communicator.send_json_to({
+                    "type": "message",
+                    "peer_id": peer_id,
+                    "message": f"{seq}: benchmark message body",
+                })
+                if options["interval"]:
+                    await asyncio.sleep(options["interval"])
+
+        readers = [asyncio.create_task(reader(user)) for user in people]
+        queries_before = counter.count
+        started = time.perf_counter()
+        await asyncio.gather(*(writer(user) for user in people))
+        try:
+            await asyncio.wait_for(all_received.wait(), options["timeout"])
+        except asyncio.TimeoutError:
+            pass
+        if settings.CHAT_WRITE_BEHIND:
+            await message_buffer.flush()
+        elapsed = time.perf_counter() - started
+        message_queries = counter.count - queries_before
+
+        for task in readers:
+            task.cancel()
+        await asyncio.gather(*readers, return_exceptions=True)
+
+        # Presence churn on the way out
+        disconnect_started = time.perf_counter()
+        await asyncio.gather(*(communicator.disconnect() for communicator in sockets.values()))
+        disconnect_ms = (time.perf_counter() - disconnect_started) * 1000
+
+        connection_created.disconnect(counter.attach)
+
+        typing_sent = expected * options["typing"]
+        return {
+            "messages": {
+                "sent": expected,
+                "delivered": len(latencies),
+                "lost": expected - len(latencies),
+                "per_second": round(len(latencies) / elapsed, 1) if elapsed else None,
+                "elapsed_s": round(elapsed, 3),
+            },
+            "latency_ms": {
+                "p50": percentile(latencies, 50),
+                "p95": percentile(latencies, 95),
+                "p99": percentile(latencies, 99),
+                "max": round(max(latencies), 3) if latencies else None,
+                "mean": round(statistics.fmean(latencies), 3) if latencies else None,
+            },
+            "db": {
+                "queries": message_queries,
+                "queries_per_message": round(message_queries / expected, 2) if expected else None,
+            },
+            "typing": {
+                "frames_sent": typing_sent,
+                "frames_delivered": typing_frames,
+                "suppressed_pct": round(100 * (1 - typing_frames / typing_sent), 1) if typing_sent else None,
+            },
+            "connections": {
+                "connect_ms_p50": percentile(connect_ms, 50),
+                "connect_ms_p95": percentile(connect_ms, 95),
+                "disconnect_all_ms": round(disconnect_ms, 3),
+            },
+        }
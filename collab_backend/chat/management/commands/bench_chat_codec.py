@@ -0,0 +1,81 @@
+import json
+import timeit
+
+from django.core.management.base import BaseCommand
+
+from chat.codec import JsonCodec, MsgpackCodec
+
+
+def sample_events():
+    message = "Hey! Loved the draft, can we push the reel to Friday and add one more story?"
+    return {
+        "chat_message": {
+            "type": "chat_message",
+            "sender_id": 48213,
+            "receiver_id": 51877,
+            "sender_username": "glowup_studio",
+            "message": message,
+        },
+        "inbox_message": {
+            "type": "new_message",
+            "peer_id": 48213,
+            "self": False,
+            "sender_id": 48213,
+            "sender_username": "glowup_studio",
+            "message": message,
+        },
+        "typing_start": {
+            "type": "typing_start",
+            "sender_id": 48213,
+            "receiver_id": 51877,
+            "sender_username": "glowup_studio",
+        },
+        "user_status": {"type": "user_online", "user_id": 48213},
+        "presence_snapshot_50": {
+            "type": "presence_snapshot",
+            "users": [
+                {"user_id": 48000 + i, "status": "online" if i % 3 else "offline"}
+                for i in range(50)
+            ],
+        },
+    }
+
+
+class Command(BaseCommand):
+    help = "Compare bytes per frame and encode CPU of the JSON and msgpack chat protocols"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20000)
+        parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        codecs = {"json": JsonCodec(), "msgpack": MsgpackCodec()}
+        results = {}
+
+        for name, payload in sample_events().items():
+            row = {}
+            for codec_name, codec in codecs.items():
+                frame = codec.encode(payload)
+                data = frame.get("text_data") or frame.get("bytes_data")
+                size = len(data.encode() if isinstance(data, str) else data)
+                seconds = timeit.timeit(lambda: codec.encode(payload), number=iterations)
+                row[codec_name] = {
+                    "bytes": size,
+                    "encode_us": round(seconds / iterations * 1e6, 3),
+                }
+            row["bytes_saved_pct"] = round(
+                100 * (1 - row["msgpack"]["bytes"] / row["json"]["bytes"]), 1
+            )
+            results[name] = row
+
+        if options["json"]:
+            self.stdout.write(json.dumps({"iterations": iterations, "results": results}, indent=2))
+            return
+
+        self.stdout.write(f"{'event':<22}{'json B':>8}{'mpack B':>9}{'saved':>8}{'json us':>10}{'mpack us':>10}")
+        for name, row in results.items():
+            self.stdout.write(
+                f"{name:<22}{row['json']['bytes']:>8}{row['msgpack']['bytes']:>9}"
+                f"{row['bytes_saved_pct']:>7}%{row['json']['encode_us']:>10}{row['msgpack']['encode_us']:>10}"
+            )
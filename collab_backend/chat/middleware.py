@@ -3,19 +3,19 @@ import urllib.parse
 from django.contrib.auth import get_user_model
 from rest_framework_simplejwt.tokens import UntypedToken
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
-from channels.db import database_sync_to_async
 from channels.middleware import BaseMiddleware
 from django.contrib.auth.models import AnonymousUser
 import jwt
 from django.conf import settings
 
+from .user_cache import user_cache
+
 User = get_user_model()
 
-@database_sync_to_async
-def get_user(user_id):
+async def get_user(user_id):
     try:
-        return User.objects.get(id=user_id)
-    except User.DoesNotExist:
+        return await user_cache.aget(user_id)
+    except (User.DoesNotExist, ValueError, TypeError):
         return AnonymousUser()
 
 class JWTAuthMiddleware(BaseMiddleware):
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0002_chatmessage_updated_at_and_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Conversation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_message_preview', models.CharField(blank=True, max_length=255)),
+                ('last_message_at', models.DateTimeField(blank=True, null=True)),
+                ('low_unread', models.PositiveIntegerField(default=0)),
+                ('high_unread', models.PositiveIntegerField(default=0)),
+                ('low_last_read_id', models.BigIntegerField(default=0)),
+                ('high_last_read_id', models.BigIntegerField(default=0)),
+                ('last_message', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='chat.chatmessage')),
+                ('last_sender', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('user_high', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('user_low', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user_low', '-last_message_at', '-id'], name='chat_conv_low_recent_idx'), models.Index(fields=['user_high', '-last_message_at', '-id'], name='chat_conv_high_recent_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user_low', 'user_high'), name='chat_conversation_pair_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+from django.db import migrations
+from django.db.models import Max
+
+PREVIEW_LENGTH = 140
+CHUNK = 1000
+
+
+def backfill_conversations(apps, schema_editor):
+    """
+    One Conversation per user pair that already exchanged messages. History
+    before this migration counts as read, so unread counters start at 0 and
+    read cursors at the last message.
+    """
+    ChatMessage = apps.get_model("chat", "ChatMessage")
+    Conversation = apps.get_model("chat", "Conversation")
+
+    last_ids = {}
+    directed = (
+        ChatMessage.objects.filter(is_system=False, sender__isnull=False)
+        .values("sender_id", "receiver_id")
+        .annotate(last_id=Max("id"))
+    )
+    for row in directed:
+        if row["sender_id"] == row["receiver_id"]:
+            continue
+        pair = (min(row["sender_id"], row["receiver_id"]), max(row["sender_id"], row["receiver_id"]))
+        last_ids[pair] = max(last_ids.get(pair, 0), row["last_id"])
+
+    pairs = sorted(last_ids.items())
+    for start in range(0, len(pairs), CHUNK):
+        chunk = pairs[start:start + CHUNK]
+        messages = ChatMessage.objects.in_bulk([last_id for _, last_id in chunk])
+        Conversation.objects.bulk_create([
+            Conversation(
+                user_low_id=low_id,
+                user_high_id=high_id,
+                last_message_id=last_id,
+                last_sender_id=messages[last_id].sender_id,
+                last_message_preview="" if messages[last_id].is_deleted else messages[last_id].message[:PREVIEW_LENGTH],
+                last_message_at=messages[last_id].created_at,
+                low_last_read_id=last_id,
+                high_last_read_id=last_id,
+            )
+            for (low_id, high_id), last_id in chunk
+        ], ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0003_conversation'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_conversations, migrations.RunPython.noop),
+    ]
@@ -22,11 +22,60 @@ class ChatMessage(models.Model):
     message = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     edited_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     is_deleted = models.BooleanField(default=False)
     is_system = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["sender", "receiver", "created_at", "id"],
+                name="chat_msg_pair_created_idx",
+            ),
+            models.Index(
+                fields=["receiver", "is_system", "created_at", "id"],
+                name="chat_msg_recv_sys_idx",
+            ),
+        ]
+
     def __str__(self):
         if self.is_system:
             return f"System → {self.receiver}: {self.message[:30]}"
         return f"{self.sender} → {self.receiver}: {self.message[:30]}"
+
+
+class Conversation(models.Model):
+    """
+    Inbox summary for one user pair, maintained alongside message inserts
+    (see chat.conversations). user_low is always the smaller user id.
+    """
+    user_low = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    user_high = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+
+    last_message = models.ForeignKey(
+        ChatMessage, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    last_sender = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    last_message_preview = models.CharField(max_length=255, blank=True)
+    last_message_at = models.DateTimeField(null=True, blank=True)
+
+    # Per-side unread counters and read cursors (id of the last message read)
+    low_unread = models.PositiveIntegerField(default=0)
+    high_unread = models.PositiveIntegerField(default=0)
+    low_last_read_id = models.BigIntegerField(default=0)
+    high_last_read_id = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user_low", "user_high"], name="chat_conversation_pair_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["user_low", "-last_message_at", "-id"], name="chat_conv_low_recent_idx"),
+            models.Index(fields=["user_high", "-last_message_at", "-id"], name="chat_conv_high_recent_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_low} ↔ {self.user_high}"
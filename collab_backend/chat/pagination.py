@@ -0,0 +1,37 @@
+import base64
+
+from django.utils.dateparse import parse_datetime
+
+
+def encode_cursor(timestamp, pk):
+    """
+    Opaque keyset cursor for a (timestamp, id) position.
+    """
+    raw = f"{timestamp.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """
+    Inverse of encode_cursor. Returns (timestamp, id) or raises ValueError.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        timestamp, pk = raw.rsplit("|", 1)
+        parsed = parse_datetime(timestamp)
+        pk = int(pk)
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
+    if parsed is None:
+        raise ValueError("Invalid cursor")
+    return parsed, pk
+
+
+def parse_limit(value, default, maximum):
+    try:
+        limit = int(value) if value is not None else default
+    except (TypeError, ValueError):
+        limit = default
+    return max(1, min(limit, maximum))
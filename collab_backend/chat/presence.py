@@ -0,0 +1,300 @@
+import asyncio
+import atexit
+import logging
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from channels.db import database_sync_to_async
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_INTERVAL = getattr(settings, "PRESENCE_HEARTBEAT_INTERVAL", 30)
+PRESENCE_TTL = getattr(settings, "PRESENCE_TTL", HEARTBEAT_INTERVAL * 3)
+FLUSH_INTERVAL = getattr(settings, "PRESENCE_FLUSH_INTERVAL", 5)
+
+
+def presence_group(user_id):
+    """
+    Channel-layer group of everyone watching user_id's online status.
+    """
+    return f"presence_{user_id}"
+
+
+def to_datetime(epoch):
+    return datetime.fromtimestamp(epoch, tz=dt_timezone.utc) if epoch else None
+
+
+class RedisPresenceStore:
+    """
+    Reference-counted presence kept in the channel-layer Redis.
+
+    presence:user:<id>  ZSET channel_name -> heartbeat deadline
+    presence:conns      ZSET "<id>|<channel_name>" -> deadline (sweep index)
+    presence:online     SET of online user ids
+    presence:last_seen  HASH user id -> epoch seconds
+
+    A user is online while their ZSET is non-empty, so two tabs keep them
+    online until the last one closes. Connections from a crashed process
+    stop heartbeating and are reaped by sweep().
+    """
+
+    def __init__(self, url):
+        self.url = url
+        self._clients = {}
+        self._sync_client = None
+
+    def _client(self):
+        import redis.asyncio
+
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = self._clients[loop] = redis.asyncio.Redis.from_url(self.url)
+        return client
+
+    def _sync(self):
+        import redis
+
+        if self._sync_client is None:
+            self._sync_client = redis.Redis.from_url(self.url)
+        return self._sync_client
+
+    async def connect(self, user_id, channel_name):
+        now = time.time()
+        pipe = self._client().pipeline(transaction=True)
+        pipe.zadd(f"presence:user:{user_id}", {channel_name: now + PRESENCE_TTL})
+        pipe.zadd("presence:conns", {f"{user_id}|{channel_name}": now + PRESENCE_TTL})
+        pipe.zcard(f"presence:user:{user_id}")
+        pipe.sadd("presence:online", user_id)
+        pipe.hset("presence:last_seen", user_id, now)
+        _, _, count, _, _ = await pipe.execute()
+        return count == 1
+
+    async def heartbeat(self, user_id, channel_name):
+        deadline = time.time() + PRESENCE_TTL
+        pipe = self._client().pipeline(transaction=True)
+        pipe.zadd(f"presence:user:{user_id}", {channel_name: deadline}, xx=True)
+        pipe.zadd("presence:conns", {f"{user_id}|{channel_name}": deadline}, xx=True)
+        await pipe.execute()
+
+    async def disconnect(self, user_id, channel_name):
+        return await self._remove(self._client(), user_id, channel_name)
+
+    async def _remove(self, client, user_id, channel_name):
+        from redis.exceptions import WatchError
+
+        now = time.time()
+        pipe = client.pipeline(transaction=True)
+        pipe.zrem(f"presence:user:{user_id}", channel_name)
+        pipe.zrem("presence:conns", f"{user_id}|{channel_name}")
+        pipe.zcard(f"presence:user:{user_id}")
+        removed, _, count = await pipe.execute()
+        if not removed or count:
+            return False
+
+        # Last connection gone. Re-check inside a transaction so a tab that
+        # connected in between keeps the user online.
+        async with client.pipeline(transaction=True) as pipe:
+            await pipe.watch(f"presence:user:{user_id}")
+            if await pipe.zcard(f"presence:user:{user_id}"):
+                return False
+            pipe.multi()
+            pipe.srem("presence:online", user_id)
+            pipe.hset("presence:last_seen", user_id, now)
+            try:
+                await pipe.execute()
+            except WatchError:
+                return False
+        return True
+
+    async def sweep(self):
+        """
+        Drop connections whose deadline passed. Returns user ids that went
+        offline as a result. Only one process sweeps per heartbeat interval.
+        """
+        client = self._client()
+        if not await client.set("presence:sweep_lock", 1, nx=True, ex=HEARTBEAT_INTERVAL):
+            return []
+
+        stale = await client.zrangebyscore("presence:conns", "-inf", time.time(), start=0, num=500)
+        offline = []
+        for member in stale:
+            user_id, channel_name = member.decode().split("|", 1)
+            user_id = int(user_id)
+            if await self._remove(client, user_id, channel_name):
+                offline.append(user_id)
+        return offline
+
+    async def is_online(self, user_id):
+        return bool(await self._client().sismember("presence:online", user_id))
+
+    def snapshot(self):
+        """
+        Sync read for plain Django views: (online user ids, {id: last_seen epoch}).
+        """
+        client = self._sync()
+        pipe = client.pipeline(transaction=False)
+        pipe.smembers("presence:online")
+        pipe.hgetall("presence:last_seen")
+        online, last_seen = pipe.execute()
+        return (
+            {int(user_id) for user_id in online},
+            {int(k): float(v) for k, v in last_seen.items()},
+        )
+
+
+class LocalPresenceStore:
+    """
+    Same contract as RedisPresenceStore, held in process memory. Used with
+    the in-memory channel layer (local development, tests).
+    """
+
+    def __init__(self):
+        self._connections = {}
+        self._last_seen = {}
+
+    async def connect(self, user_id, channel_name):
+        conns = self._connections.setdefault(user_id, {})
+        conns[channel_name] = time.time() + PRESENCE_TTL
+        self._last_seen[user_id] = time.time()
+        return len(conns) == 1
+
+    async def heartbeat(self, user_id, channel_name):
+        conns = self._connections.get(user_id, {})
+        if channel_name in conns:
+            conns[channel_name] = time.time() + PRESENCE_TTL
+
+    async def disconnect(self, user_id, channel_name):
+        conns = self._connections.get(user_id, {})
+        if conns.pop(channel_name, None) is None or conns:
+            return False
+        del self._connections[user_id]
+        self._last_seen[user_id] = time.time()
+        return True
+
+    async def sweep(self):
+        now = time.time()
+        offline = []
+        for user_id, conns in list(self._connections.items()):
+            for channel_name, deadline in list(conns.items()):
+                if deadline < now and await self.disconnect(user_id, channel_name):
+                    offline.append(user_id)
+        return offline
+
+    async def is_online(self, user_id):
+        return bool(self._connections.get(user_id))
+
+    def snapshot(self):
+        return set(self._connections), dict(self._last_seen)
+
+
+class PresenceWriter:
+    """
+    Coalesces presence transitions and persists them to accounts.User with
+    one bulk_update(["is_online", "last_seen"]) per FLUSH_INTERVAL. Only
+    the latest state per user is written.
+    """
+
+    def __init__(self, flush_interval):
+        self.flush_interval = flush_interval
+        self._dirty = {}
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def mark(self, user_id, is_online):
+        with self._lock:
+            self._dirty[user_id] = (is_online, to_datetime(time.time()))
+
+        if self._timer is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self.flush_sync()
+                return
+            self._timer = loop.call_later(
+                self.flush_interval,
+                lambda: loop.create_task(self.flush()),
+            )
+
+    async def flush(self):
+        batch = self._drain()
+        if batch:
+            await database_sync_to_async(self._write)(batch)
+
+    def flush_sync(self):
+        batch = self._drain()
+        if batch:
+            self._write(batch)
+
+    def _drain(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        with self._lock:
+            batch, self._dirty = self._dirty, {}
+        return batch
+
+    def _write(self, batch):
+        from django.contrib.auth import get_user_model
+
+        User = get_user_model()
+        users = [
+            User(id=user_id, is_online=is_online, last_seen=last_seen)
+            for user_id, (is_online, last_seen) in batch.items()
+        ]
+        try:
+            User.objects.bulk_update(users, ["is_online", "last_seen"])
+        except Exception:
+            logger.exception("presence flush of %d users failed", len(users))
+
+
+def _build_store():
+    backend = settings.CHANNEL_LAYERS["default"]["BACKEND"]
+    if "redis" in backend.lower():
+        return RedisPresenceStore(settings.REDIS_URL)
+    return LocalPresenceStore()
+
+
+class PresenceStoreProxy:
+    """
+    Picks the store matching CHANNEL_LAYERS on first use rather than at
+    import, so code that swaps the channel layer after startup (bench_chat,
+    tests) gets a matching store. reset() forces a fresh pick.
+    """
+
+    def __init__(self):
+        self._store = None
+
+    def reset(self):
+        self._store = None
+
+    def __getattr__(self, name):
+        if self._store is None:
+            self._store = _build_store()
+        return getattr(self._store, name)
+
+
+presence_store = PresenceStoreProxy()
+presence_writer = PresenceWriter(FLUSH_INTERVAL)
+
+atexit.register(presence_writer.flush_sync)
+
+
+async def broadcast_status(channel_layer, user_id, status):
+    await channel_layer.group_send(
+        presence_group(user_id),
+        {
+            "type": "user_status",
+            "user_id": user_id,
+            "status": status,
+        },
+    )
+
+
+async def sweep_and_broadcast(channel_layer):
+    for user_id in await presence_store.sweep():
+        presence_writer.mark(user_id, False)
+        await broadcast_status(channel_layer, user_id, "offline")
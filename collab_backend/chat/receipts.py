@@ -0,0 +1,57 @@
+import asyncio
+
+from channels.db import database_sync_to_async
+from django.conf import settings
+
+from .conversations import mark_read
+
+ACK_WINDOW = getattr(settings, "READ_ACK_WINDOW_MS", 300) / 1000
+
+
+class ReadAckBatcher:
+    """
+    Per-connection coalescing of "read up to message id X" acks.
+
+    The first ack for a peer opens an ACK_WINDOW; later acks inside it
+    only raise the pending id. When the window closes the highest id is
+    applied with one mark_read() UPDATE and, if the cursor moved, the new
+    cursor is handed to `on_read(peer_id, cursor)` for broadcasting.
+    """
+
+    def __init__(self, reader_id, on_read, window=ACK_WINDOW):
+        self.reader_id = reader_id
+        self.on_read = on_read
+        self.window = window
+        self.received = 0
+        self.written = 0
+        self._pending = {}
+        self._timers = {}
+
+    def ack(self, peer_id, message_id):
+        self.received += 1
+        self._pending[peer_id] = max(self._pending.get(peer_id, 0), message_id)
+
+        if peer_id not in self._timers:
+            loop = asyncio.get_running_loop()
+            self._timers[peer_id] = loop.call_later(
+                self.window,
+                lambda: loop.create_task(self.flush(peer_id)),
+            )
+
+    async def flush(self, peer_id):
+        timer = self._timers.pop(peer_id, None)
+        if timer is not None:
+            timer.cancel()
+
+        message_id = self._pending.pop(peer_id, None)
+        if message_id is None:
+            return
+
+        self.written += 1
+        cursor = await database_sync_to_async(mark_read)(self.reader_id, peer_id, message_id)
+        if cursor is not None:
+            await self.on_read(peer_id, cursor)
+
+    async def flush_all(self):
+        for peer_id in list(self._pending):
+            await self.flush(peer_id)
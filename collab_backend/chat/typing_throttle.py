@@ -0,0 +1,99 @@
+import asyncio
+import time
+
+from django.conf import settings
+
+MIN_INTERVAL = getattr(settings, "TYPING_MIN_INTERVAL_MS", 500) / 1000
+TYPING_TIMEOUT = getattr(settings, "TYPING_TIMEOUT", 5)
+
+
+class _PeerTyping:
+    __slots__ = ("wanted", "published", "last_at", "flush_handle", "timeout_handle")
+
+    def __init__(self):
+        self.wanted = False
+        self.published = False
+        self.last_at = float("-inf")
+        self.flush_handle = None
+        self.timeout_handle = None
+
+
+class TypingThrottle:
+    """
+    Per-connection debounce for typing_start/typing_stop.
+
+    Clients send typing_start on every keystroke; only state transitions
+    are passed to `publish(peer_id, msg_type)`, and at most one per
+    MIN_INTERVAL per peer (a flip inside the window is deferred to its
+    end, and dropped if it flipped back). A peer left "typing" for
+    TYPING_TIMEOUT without a fresh typing_start gets an automatic
+    typing_stop, as does every peer on stop_all() (disconnect).
+    """
+
+    def __init__(self, publish, min_interval=MIN_INTERVAL, timeout=TYPING_TIMEOUT):
+        self.publish = publish
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self.received = 0
+        self.published = 0
+        self._peers = {}
+
+    async def update(self, peer_id, typing):
+        self.received += 1
+        state = self._peers.setdefault(peer_id, _PeerTyping())
+        state.wanted = typing
+
+        if state.timeout_handle is not None:
+            state.timeout_handle.cancel()
+            state.timeout_handle = None
+        if typing:
+            loop = asyncio.get_running_loop()
+            state.timeout_handle = loop.call_later(
+                self.timeout,
+                lambda: loop.create_task(self._expire(peer_id)),
+            )
+
+        await self._sync(peer_id, state)
+
+    async def _expire(self, peer_id):
+        state = self._peers.get(peer_id)
+        if state is not None:
+            state.timeout_handle = None
+            state.wanted = False
+            await self._sync(peer_id, state)
+
+    async def _flush(self, peer_id):
+        state = self._peers.get(peer_id)
+        if state is not None:
+            state.flush_handle = None
+            await self._sync(peer_id, state)
+
+    async def _sync(self, peer_id, state):
+        if state.wanted == state.published:
+            if state.flush_handle is not None:
+                state.flush_handle.cancel()
+                state.flush_handle = None
+            return
+
+        wait = state.last_at + self.min_interval - time.monotonic()
+        if wait <= 0:
+            state.published = state.wanted
+            state.last_at = time.monotonic()
+            self.published += 1
+            await self.publish(peer_id, "typing_start" if state.wanted else "typing_stop")
+        elif state.flush_handle is None:
+            loop = asyncio.get_running_loop()
+            state.flush_handle = loop.call_later(
+                wait,
+                lambda: loop.create_task(self._flush(peer_id)),
+            )
+
+    async def stop_all(self):
+        peers, self._peers = self._peers, {}
+        for peer_id, state in peers.items():
+            for handle in (state.flush_handle, state.timeout_handle):
+                if handle is not None:
+                    handle.cancel()
+            if state.published:
+                self.published += 1
+                await self.publish(peer_id, "typing_stop")
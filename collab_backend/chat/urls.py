@@ -8,4 +8,5 @@ urlpatterns = [
    path("history/<int:user_id>/", views.chat_history, name="chat_history"),
    path("message/<int:message_id>/edit/", views.edit_message, name="edit_message"),
    path("message/<int:message_id>/delete/", views.delete_message, name="delete_message"),
+   path("conversations/", views.conversation_list, name="conversation_list"),
 ]
@@ -0,0 +1,103 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from channels.db import database_sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+User = get_user_model()
+
+
+class UserCache:
+    """
+    In-process LRU + TTL cache of User rows keyed by id.
+
+    Used on the WebSocket handshake path (JWTAuthMiddleware and the
+    consumer's peer lookup) so a hit costs no thread hop and no query.
+    Local saves/deletes invalidate through signals; the TTL bounds how
+    long another process's stale copy can live. Callers get a shallow
+    copy, never the cached instance itself.
+    """
+
+    def __init__(self, maxsize=10000, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                user, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(user_id)
+                    self.hits += 1
+                    return copy.copy(user)
+                del self._entries[user_id]
+            self.misses += 1
+        return None
+
+    def set(self, user, generation=None):
+        with self._lock:
+            # Skip if an invalidation happened while the row was being loaded
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[user.pk] = (copy.copy(user), time.monotonic() + self.ttl)
+            self._entries.move_to_end(user.pk)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    @property
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._entries),
+        }
+
+    def _load(self, user_id, generation):
+        user = User.objects.get(id=user_id)
+        self.set(user, generation)
+        return user
+
+    async def aget(self, user_id):
+        """
+        Cached User.objects.get(id=user_id); raises User.DoesNotExist.
+        """
+        user = self.get(user_id)
+        if user is not None:
+            return user
+        return await database_sync_to_async(self._load)(user_id, self._generation)
+
+
+user_cache = UserCache(
+    maxsize=getattr(settings, "USER_CACHE_MAX_SIZE", 10000),
+    ttl=getattr(settings, "USER_CACHE_TTL", 60),
+)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)
@@ -3,7 +3,10 @@ from django.shortcuts import render, get_object_or_404
 from django.contrib.auth import get_user_model
 from django.db.models import Q
 from django.utils import timezone
-from .models import ChatMessage
+from .conversations import refresh_preview
+from .models import ChatMessage, Conversation
+from .pagination import decode_cursor, encode_cursor, parse_limit
+from .presence import presence_store, to_datetime
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -40,38 +43,121 @@ def chat_room(request, user_id):
 
 def user_list(request):
     users = list(User.objects.values("id", "username", "is_online", "last_seen"))
+
+    # Live presence wins over the (lazily persisted) DB columns
+    online, last_seen = presence_store.snapshot()
+    for user in users:
+        user["is_online"] = user["id"] in online
+        seen = to_datetime(last_seen.get(user["id"]))
+        if seen and (user["last_seen"] is None or seen > user["last_seen"]):
+            user["last_seen"] = seen
+
     return JsonResponse(users, safe=False)
 
 
+HISTORY_PAGE_SIZE = 50
+HISTORY_MAX_PAGE_SIZE = 200
+
+
+def serialize_history_message(msg, user):
+    return {
+        "id": msg.id,
+        "message": msg.message,
+        "sender_username": (
+            "Team CollabCreation"
+            if msg.is_system or msg.sender is None
+            else msg.sender.username
+        ),
+        "self": msg.sender_id == user.id,
+        "is_system": msg.is_system,
+        "created_at": msg.created_at.isoformat(),
+        "edited_at": msg.edited_at.isoformat() if msg.edited_at else None,
+        "is_deleted": msg.is_deleted,
+    }
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def chat_history(request, user_id):
+    """
+    Keyset-paginated history between request.user and user_id.
+
+    Query params:
+      limit   page size (default 50, max 200)
+      before  cursor → older page (default: latest page)
+      after   cursor → newer page
+      since   sync_token from a previous response → only rows created,
+              edited or deleted after it, oldest change first
+
+    Results are always returned oldest → newest. `next_cursor` continues
+    in the same direction (null when exhausted), `sync_token` is the
+    watermark to pass back as `since` for delta sync.
+    """
     selected_user = get_object_or_404(User, id=user_id)
+    params = request.query_params
+    limit = parse_limit(params.get("limit"), HISTORY_PAGE_SIZE, HISTORY_MAX_PAGE_SIZE)
+
+    try:
+        before = decode_cursor(params["before"]) if params.get("before") else None
+        after = decode_cursor(params["after"]) if params.get("after") else None
+        since = decode_cursor(params["since"]) if params.get("since") else None
+    except ValueError:
+        return Response({"error": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST)
 
     messages_qs = ChatMessage.objects.filter(
         Q(sender=request.user, receiver=selected_user) |
         Q(sender=selected_user, receiver=request.user) |
         Q(is_system=True, receiver=request.user)
-    ).order_by("created_at")
+    ).select_related("sender").only(
+        "id", "message", "sender_id", "sender__username", "is_system",
+        "created_at", "edited_at", "updated_at", "is_deleted",
+    )
+
+    if since:
+        since_at, since_id = since
+        messages_qs = messages_qs.filter(
+            Q(updated_at__gt=since_at) | Q(updated_at=since_at, id__gt=since_id)
+        ).order_by("updated_at", "id")
+    elif after:
+        after_at, after_id = after
+        messages_qs = messages_qs.filter(
+            Q(created_at__gt=after_at) | Q(created_at=after_at, id__gt=after_id)
+        ).order_by("created_at", "id")
+    else:
+        if before:
+            before_at, before_id = before
+            messages_qs = messages_qs.filter(
+                Q(created_at__lt=before_at) | Q(created_at=before_at, id__lt=before_id)
+            )
+        messages_qs = messages_qs.order_by("-created_at", "-id")
+
+    page = list(messages_qs[:limit + 1])
+    has_more = len(page) > limit
+    page = page[:limit]
 
-    data = [
-        {
-            "id": msg.id,
-            "message": msg.message,
-            "sender_username": (
-                "Team CollabCreation"
-                if msg.is_system
-                else msg.sender.username
-            ),
-            "self": (msg.sender == request.user) if msg.sender else False,
-            "is_system": msg.is_system,
-            "edited_at": msg.edited_at.isoformat() if msg.edited_at else None,
-            "is_deleted": msg.is_deleted,
-        }
-        for msg in messages_qs
-    ]
+    next_cursor = None
+    if has_more and page:
+        edge = page[-1]
+        if since:
+            next_cursor = encode_cursor(edge.updated_at, edge.id)
+        else:
+            next_cursor = encode_cursor(edge.created_at, edge.id)
 
-    return Response(data)
+    if not since and not after:
+        page.reverse()
+
+    if page:
+        newest = max(page, key=lambda m: (m.updated_at, m.id))
+        sync_token = encode_cursor(newest.updated_at, newest.id)
+    else:
+        sync_token = params.get("since")
+
+    return Response({
+        "results": [serialize_history_message(msg, request.user) for msg in page],
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+        "sync_token": sync_token,
+    })
 
 
 
@@ -90,6 +176,7 @@ def edit_message(request, message_id):
     message.message = new_message
     message.edited_at = timezone.now()
     message.save()
+    refresh_preview(message)
 
     return Response({
         "id": message.id,
@@ -108,6 +195,69 @@ def delete_message(request, message_id):
 
     message.is_deleted = True
     message.save()
+    refresh_preview(message)
 
     return Response({"message": "Message deleted successfully"})
 
+
+INBOX_PAGE_SIZE = 30
+INBOX_MAX_PAGE_SIZE = 100
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def conversation_list(request):
+    """
+    The user's conversations, most recent first, with their unread count.
+
+    Reads only Conversation rows (one joined query per page), so the cost
+    is independent of how many messages each thread holds. Paginate with
+    `before=<next_cursor>`.
+    """
+    user = request.user
+    limit = parse_limit(request.query_params.get("limit"), INBOX_PAGE_SIZE, INBOX_MAX_PAGE_SIZE)
+
+    conversations = Conversation.objects.filter(
+        Q(user_low=user) | Q(user_high=user),
+        last_message_at__isnull=False,
+    ).select_related("user_low", "user_high").order_by("-last_message_at", "-id")
+
+    before = request.query_params.get("before")
+    if before:
+        try:
+            before_at, before_id = decode_cursor(before)
+        except ValueError:
+            return Response({"error": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST)
+        conversations = conversations.filter(
+            Q(last_message_at__lt=before_at) | Q(last_message_at=before_at, id__lt=before_id)
+        )
+
+    page = list(conversations[:limit + 1])
+    has_more = len(page) > limit
+    page = page[:limit]
+
+    results = []
+    for conversation in page:
+        is_low = conversation.user_low_id == user.id
+        peer = conversation.user_high if is_low else conversation.user_low
+        results.append({
+            "id": conversation.id,
+            "peer_id": peer.id,
+            "peer_username": peer.username,
+            "last_message_id": conversation.last_message_id,
+            "last_message": conversation.last_message_preview,
+            "last_message_self": conversation.last_sender_id == user.id,
+            "last_message_at": conversation.last_message_at.isoformat(),
+            "unread": conversation.low_unread if is_low else conversation.high_unread,
+            "last_read_id": conversation.low_last_read_id if is_low else conversation.high_last_read_id,
+        })
+
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor(page[-1].last_message_at, page[-1].id)
+
+    return Response({
+        "results": results,
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+    })
@@ -18,22 +18,37 @@ export default function Notification() {
   };
 
   useEffect(() => {
+    const fetchUnread = async () => {
+      try {
+        const res = await fetch(`${API_BASE}/notifications/unread-count/`, { headers });
+        if (!res.ok) return;
+        const data = await res.json();
+        setUnread(data.unread > 0);
+      } catch (err) {
+        console.error("Notification fetch error", err);
+      }
+    };
+
+    fetchUnread();
+    const interval = setInterval(fetchUnread, 10000);
+    return () => clearInterval(interval);
+  }, []);
+
+  useEffect(() => {
+    if (!open) return;
     const fetchNotifications = async () => {
       try {
         const res = await fetch(`${API_BASE}/notifications/`, { headers });
         if (!res.ok) return;
         const data = await res.json();
-        setNotifications(data);
-        setUnread(data.some((n) => !n.is_read));
+        setNotifications(data.results);
       } catch (err) {
         console.error("Notification fetch error", err);
       }
     };
 
     fetchNotifications();
-    const interval = setInterval(fetchNotifications, 10000);
-    return () => clearInterval(interval);
-  }, []);
+  }, [open]);
 
   return (
     <div className="notification-wrapper">
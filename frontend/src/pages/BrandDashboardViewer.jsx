@@ -35,7 +35,7 @@ export default function BrandDashboardViewer() {
         });
         if (!projectsRes.ok) throw new Error("Projects fetch failed");
         const brandProjects = await projectsRes.json();
-        setProjects(brandProjects);
+        setProjects(brandProjects.results);
       } catch (err) {
         console.error(err);
         setError(err.message);
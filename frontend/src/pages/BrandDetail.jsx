@@ -13,13 +13,11 @@ const BrandDetail = () => {
       .then((res) => res.json())
       .then((data) => {
         setBrand(data);
-        fetch(`${API_BASE}/projects/`, {
+        fetch(`${API_BASE}/brands/${data.user}/projects/`, {
           headers: { Authorization: `Bearer ${localStorage.getItem("access")}` },
         })
           .then((res) => res.json())
-          .then((allProjects) =>
-            setProjects(allProjects.filter((p) => p.brand === data.user))
-          );
+          .then((brandProjects) => setProjects(brandProjects.results));
       });
   }, [id]);
 
@@ -22,7 +22,7 @@ export default function BrandProfilesPage() {
 
         if (!res.ok) throw new Error("Failed to fetch brands");
         const data = await res.json();
-        setBrands(data);
+        setBrands(data.results);
       } catch (err) {
         console.error("❌ Error fetching brands:", err);
         setError(err.message);
@@ -51,11 +51,11 @@ export default function BrandProfilesPage() {
                 className="profile-pic"
               />
               <div className="profile-info">
-                <h2>{brand.full_name || "Unnamed Brand"}</h2>
+                <h2>{brand.brand_name || "Unnamed Brand"}</h2>
                 <p>@{brand.username || "unknown"}</p>
                 <p><strong>Industry:</strong> {brand.industry || "N/A"}</p>
                 <p><strong>Projects:</strong> {brand.projects_count || 0}</p>
-                {brand.bio && <p><strong>Bio:</strong> {brand.bio}</p>}
+                {brand.description && <p><strong>Bio:</strong> {brand.description}</p>}
               </div>
             </Link>
           ))
@@ -13,6 +13,8 @@ export default function ChatApp() {
   const [typingUser, setTypingUser] = useState(null);
   const [editingMessage, setEditingMessage] = useState(null);
   const [editInput, setEditInput] = useState("");
+  const [olderCursor, setOlderCursor] = useState(null);
+  const [loadingOlder, setLoadingOlder] = useState(false);
   const ws = useRef(null);
   const typingTimeoutRef = useRef(null);
 
@@ -47,34 +49,53 @@ export default function ChatApp() {
     }
   }, [urlUserId, users]);
 
+  const toChatMessage = (msg) => ({
+    id: msg.id,
+    text: msg.message,
+    self: msg.self, // use API-provided flag
+    sender: msg.self ? "You" : msg.sender_username,
+    edited_at: msg.edited_at,
+    is_deleted: msg.is_deleted,
+  });
+
+  // History is keyset paginated: newest page first, older pages via ?before=
+  const fetchHistoryPage = async (before) => {
+    const query = before ? `?before=${encodeURIComponent(before)}` : "";
+    const res = await fetch(
+      `${BASE_URL}/chat/history/${selectedUser.id}/${query}`,
+      {
+        headers: {
+          Authorization: `Bearer ${token}`,
+        },
+      }
+    );
+    if (!res.ok) throw new Error("Failed to fetch chat history");
+    return res.json();
+  };
+
+  const loadOlderMessages = async () => {
+    if (!olderCursor || loadingOlder) return;
+    setLoadingOlder(true);
+    try {
+      const data = await fetchHistoryPage(olderCursor);
+      setMessages((prev) => [...data.results.map(toChatMessage), ...prev]);
+      setOlderCursor(data.has_more ? data.next_cursor : null);
+    } catch (err) {
+      console.error("❌ Failed to fetch older messages:", err);
+    } finally {
+      setLoadingOlder(false);
+    }
+  };
+
   // Fetch chat history & setup WebSocket
   useEffect(() => {
     if (!currentUser || !selectedUser) return;
 
     const fetchHistory = async () => {
       try {
-        const res = await fetch(
-          `${BASE_URL}/chat/history/${selectedUser.id}/`,
-          {
-            headers: {
-              Authorization: `Bearer ${token}`,
-            },
-          }
-        );
-
-        if (!res.ok) throw new Error("Failed to fetch chat history");
-        const data = await res.json();
-
-        setMessages(
-          data.map((msg) => ({
-            id: msg.id,
-            text: msg.message,
-            self: msg.self, // use API-provided flag
-            sender: msg.self ? "You" : msg.sender_username,
-            edited_at: msg.edited_at,
-            is_deleted: msg.is_deleted,
-          }))
-        );
+        const data = await fetchHistoryPage(null);
+        setMessages(data.results.map(toChatMessage));
+        setOlderCursor(data.has_more ? data.next_cursor : null);
       } catch (err) {
         console.error("❌ Failed to fetch chat history:", err);
       }
@@ -295,6 +316,15 @@ export default function ChatApp() {
               </div>
 
               <div className="chat-messages">
+                {olderCursor && (
+                  <button
+                    className="load-older"
+                    onClick={loadOlderMessages}
+                    disabled={loadingOlder}
+                  >
+                    {loadingOlder ? "Loading..." : "Load older messages"}
+                  </button>
+                )}
                 {messages.map((msg, i) => (
                   <div
                     key={msg.id || i}
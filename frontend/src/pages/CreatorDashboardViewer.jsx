@@ -43,7 +43,7 @@ export default function CreatorDashboardViewer() {
         const projectsRes = await fetch(`${API_BASE}/projects/`);
         if (!projectsRes.ok) throw new Error("Projects fetch failed");
         const allProjects = await projectsRes.json();
-        setProjects(allProjects);
+        setProjects(allProjects.results);
 
         /* ---------------------------
            3️⃣ Fetch ONLY logged-in brand projects
@@ -54,7 +54,7 @@ export default function CreatorDashboardViewer() {
 
         if (myProjRes.ok) {
           const myData = await myProjRes.json();
-          setMyProjects(myData);
+          setMyProjects(myData.results);
         }
 
         /* ---------------------------
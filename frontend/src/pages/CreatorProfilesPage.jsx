@@ -13,7 +13,7 @@ export default function CreatorProfilesPage() {
   useEffect(() => {
     const fetchCreators = async () => {
       try {
-        const res = await fetch(`${BASE_URL}/creators/`, {
+        const res = await fetch(`${BASE_URL}/creators/discover/`, {
           headers: {
             "Content-Type": "application/json",
             Authorization: `Bearer ${token}`,
@@ -22,7 +22,7 @@ export default function CreatorProfilesPage() {
 
         if (!res.ok) throw new Error("Failed to fetch creators");
         const data = await res.json();
-        setCreators(data);
+        setCreators(data.results);
       } catch (err) {
         console.error("❌ Error fetching creators:", err);
         setError(err.message);